@@ -0,0 +1,87 @@
+"""Async usage examples for honey jars.
+
+Run from the repository root (no API keys needed, everything uses the mock jar):
+    python examples/example_async.py
+"""
+
+import asyncio
+
+from honey import mock_jar, gather_prompts
+from prompts.demo import summarize
+
+
+async def example_async_chat():
+    """Multi-turn conversation with a single async jar."""
+    print("=== Async chat ===")
+    jar = mock_jar(system_prompt="You are a helpful assistant")
+
+    messages = [
+        "Hello!",
+        "Can you summarize what a jar is?",
+        "And how does it keep history?",
+        "Thanks!",
+    ]
+
+    # Enter the jar once for the whole session instead of once per turn
+    async with jar:
+        for message in messages:
+            print(f"User: {message}")
+            print("Assistant: ", end="")
+            # Print the response as it streams in rather than after it completes
+            async for chunk in summarize.stream(text=message):
+                print(chunk, end="", flush=True)
+            print("\n")
+
+    print(f"History length: {jar.history_len}\n")
+
+
+async def example_concurrent_requests():
+    """Dispatch several independent prompts at once."""
+    print("=== Concurrent requests ===")
+    jar = mock_jar()
+
+    async with jar:
+        results = await gather_prompts(
+            summarize(text="First article"),
+            summarize(text="Second article"),
+            summarize(text="Third article"),
+        )
+
+    for result in results:
+        print(result, "\n")
+
+
+async def example_independent_conversations():
+    """Run separate conversations concurrently over one shared client."""
+    print("=== Independent conversations ===")
+    base = mock_jar(system_prompt="You are a helpful assistant")
+
+    async def converse(jar, text):
+        async with jar:
+            return await summarize(text=text)
+
+    # Each fork has its own history but reuses the base jar's API client
+    jars = [base.fork() for _ in range(3)]
+    results = await asyncio.gather(
+        *(converse(jar, f"Topic {i}") for i, jar in enumerate(jars, start=1))
+    )
+
+    for jar, result in zip(jars, results):
+        print(f"{result} ({jar.message_count} messages)\n")
+
+
+async def main():
+    await example_async_chat()
+    await example_concurrent_requests()
+    await example_independent_conversations()
+
+
+if __name__ == "__main__":
+    # uvloop's libuv-based event loop lowers per-task scheduling overhead for
+    # many concurrent requests; fall back to asyncio's loop when not installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -15,13 +15,28 @@ Usage:
         response = summarize(text="...")
 """
 
+from typing import TYPE_CHECKING
+
 from . import loader
 from . import jars
-from .jars import OpenAIJar as openai_jar
-from .jars import AnthropicJar as anthropic_jar
-from .jars import GeminiJar as gemini_jar
-from .jars import MockJar as mock_jar
-from .jars import OpenAICompatibleJar as openai_compatible_jar
+from . import batch
+from .batch import gather_prompts, parallel_map
+
+if TYPE_CHECKING:
+    from .jars import OpenAIJar as openai_jar
+    from .jars import AnthropicJar as anthropic_jar
+    from .jars import GeminiJar as gemini_jar
+    from .jars import MockJar as mock_jar
+    from .jars import OpenAICompatibleJar as openai_compatible_jar
+
+# Jar shortcuts resolve on first use, importing only that jar's module
+_JAR_ALIASES = {
+    'openai_jar': 'OpenAIJar',
+    'anthropic_jar': 'AnthropicJar',
+    'gemini_jar': 'GeminiJar',
+    'mock_jar': 'MockJar',
+    'openai_compatible_jar': 'OpenAICompatibleJar',
+}
 
 # Auto-install the loader when hive is imported
 loader.install()
@@ -29,9 +44,25 @@ loader.install()
 __all__ = [
     'loader',
     'jars',
+    'batch',
+    'gather_prompts',
+    'parallel_map',
     'openai_jar',
     'anthropic_jar',
     'gemini_jar',
     'mock_jar',
     'openai_compatible_jar',
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    jar_name = _JAR_ALIASES.get(name)
+    if jar_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(jars, jar_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
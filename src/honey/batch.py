@@ -0,0 +1,66 @@
+"""Helpers for dispatching many prompt calls concurrently.
+
+Prompt functions called inside an async jar context return coroutines. These
+helpers await many of them at once so their network round-trips overlap instead
+of running one after another.
+
+Usage:
+    from honey import anthropic_jar, gather_prompts
+    from prompts.demo import summarize
+
+    async with anthropic_jar():
+        summaries = await gather_prompts(
+            *(summarize(text=article) for article in articles),
+            max_batch=16,
+        )
+"""
+
+import asyncio
+from typing import Any, Awaitable, Iterable, List
+
+
+async def gather_prompts(*aws: Awaitable[Any], max_batch: int = 32) -> List[Any]:
+    """Await prompt calls concurrently with at most ``max_batch`` in flight.
+
+    Results are returned in the same order as the awaitables were passed in.
+
+    Args:
+        *aws: Awaitables returned by prompt functions (or ``jar.aexecute``)
+        max_batch: Maximum number of requests dispatched at the same time
+
+    Returns:
+        List of results, one per awaitable
+    """
+    if max_batch < 1:
+        raise ValueError("max_batch must be at least 1")
+
+    semaphore = asyncio.Semaphore(max_batch)
+
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws))
+
+
+async def parallel_map(aws: Iterable[Awaitable[Any]]) -> List[Any]:
+    """Await all awaitables concurrently, raising only once every one has finished.
+
+    Creating all the awaitables first and gathering them once keeps requests
+    overlapping; awaiting each result inside the loop that creates them would
+    run the requests one after another.
+
+    Args:
+        aws: Awaitables to run concurrently
+
+    Returns:
+        List of results in input order
+
+    Raises:
+        The first exception raised by any awaitable, after all have completed
+    """
+    results = await asyncio.gather(*aws, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
@@ -4,11 +4,30 @@ Jars are reusable, stateful context managers that execute prompts against LLM AP
 They support both synchronous and asynchronous execution modes.
 """
 
-from .base import Jar, get_active_jar, get_active_async_jar
-from .mock import MockJar
-from .openai import OpenAIJar, OpenAICompatibleJar, OpenAIBaseJar, OpenAIClientJar
-from .anthropic import AnthropicJar
-from .gemini import GeminiJar
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base import Jar, get_active_jar, get_active_async_jar
+    from .mock import MockJar
+    from .openai import OpenAIJar, OpenAICompatibleJar, OpenAIBaseJar, OpenAIClientJar
+    from .anthropic import AnthropicJar
+    from .gemini import GeminiJar
+
+# Jar modules are imported on first attribute access, so importing one jar
+# does not load the others
+_LAZY = {
+    'Jar': '.base',
+    'get_active_jar': '.base',
+    'get_active_async_jar': '.base',
+    'MockJar': '.mock',
+    'OpenAIJar': '.openai',
+    'OpenAICompatibleJar': '.openai',
+    'OpenAIBaseJar': '.openai',
+    'OpenAIClientJar': '.openai',
+    'AnthropicJar': '.anthropic',
+    'GeminiJar': '.gemini',
+}
 
 __all__ = [
     'Jar',
@@ -22,3 +41,17 @@ __all__ = [
     'get_active_jar',
     'get_active_async_jar',
 ]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    # Cache on the package so later lookups skip this hook
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,128 @@
+"""Shared HTTP connection pools for provider SDK clients.
+
+Each SDK client otherwise builds its own httpx client, so every new jar opens
+fresh TCP/TLS connections. Passing these shared clients as ``http_client`` lets
+all jars reuse the same keep-alive connections.
+
+The shared clients ignore ``close()``/``aclose()``, so closing one SDK client
+does not close the pool under every other jar. The pools themselves are closed
+at interpreter exit (sync) and when their event loop shuts down (async).
+"""
+
+import asyncio
+import atexit
+import threading
+import weakref
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional
+
+_sync_client = None
+_sync_lock = threading.Lock()
+
+# Async connections belong to the event loop that opened them, so each loop gets
+# its own pool: (client, generator that closes it at loop shutdown). The generator
+# keeps its loop alive, so entries are removed explicitly: at loop shutdown, or
+# when a later pool is created after the loop was closed without one
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = weakref.WeakKeyDictionary()
+
+
+def _client_options() -> dict:
+    """Keyword arguments shared by the sync and async httpx clients."""
+    import httpx
+    return {
+        # Same timeouts as the SDKs' own clients: long reads for slow generations
+        "timeout": httpx.Timeout(600.0, connect=5.0),
+        "limits": httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60.0),
+        "follow_redirects": True,
+    }
+
+
+@lru_cache(maxsize=None)
+def _shared_classes() -> tuple:
+    """Return httpx client classes whose close methods leave the pool open.
+    
+    Returns:
+        Tuple of (sync client class, async client class); ``_close_pool``
+        closes the underlying connections
+    """
+    import httpx
+    
+    class SharedClient(httpx.Client):
+        def close(self) -> None:
+            pass
+        
+        def _close_pool(self) -> None:
+            super().close()
+    
+    class SharedAsyncClient(httpx.AsyncClient):
+        async def aclose(self) -> None:
+            pass
+        
+        async def _close_pool(self) -> None:
+            await super().aclose()
+    
+    return SharedClient, SharedAsyncClient
+
+
+async def _close_at_shutdown(client: Any) -> AsyncIterator[None]:
+    """Close ``client`` when its loop finalizes async generators.
+    
+    Started up to its ``yield`` on the loop that owns ``client``, so the loop's
+    ``shutdown_asyncgens()`` (run by ``asyncio.run`` before the loop closes)
+    resumes it. Loops closed without that step leave the connections to be
+    dropped with the client.
+    """
+    try:
+        yield
+    finally:
+        loop = asyncio.get_running_loop()
+        if _async_clients.get(loop, (None,))[0] is client:
+            del _async_clients[loop]
+        await client._close_pool()
+
+
+def _drop_closed_loops() -> None:
+    """Forget the pools of loops that were closed without shutting them down."""
+    for loop in [loop for loop in _async_clients if loop.is_closed()]:
+        del _async_clients[loop]
+
+
+def get_httpx_sync():
+    """Return the process-wide ``httpx.Client``, creating it on first use."""
+    global _sync_client
+    if _sync_client is None:
+        with _sync_lock:
+            if _sync_client is None:
+                shared_client = _shared_classes()[0]
+                _sync_client = shared_client(**_client_options())
+                atexit.register(_sync_client._close_pool)
+    return _sync_client
+
+
+def get_httpx_async() -> Optional[Any]:
+    """Return the ``httpx.AsyncClient`` for the running event loop.
+
+    Returns:
+        Shared async client, or None outside a running loop (or for loops that
+        cannot be weakly referenced), in which case the SDK creates its own
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+    try:
+        entry = _async_clients.get(loop)
+    except TypeError:
+        return None
+    if entry is None or entry[0].is_closed:
+        _drop_closed_loops()
+        client = _shared_classes()[1](**_client_options())
+        closer = _close_at_shutdown(client)
+        # Run to the yield so the loop's async generator hooks register it
+        try:
+            closer.asend(None).send(None)
+        except StopIteration:
+            pass
+        entry = _async_clients[loop] = (client, closer)
+    return entry[0]
@@ -0,0 +1,137 @@
+"""Similarity lookup for the response cache.
+
+Exact cache keys miss paraphrases ("Summarize this" vs "Please summarize this").
+This cache embeds the newest user prompt and returns an earlier response when a
+previous prompt, sent after the same conversation with the same request
+parameters, is close enough by cosine similarity.
+
+numpy and the default embedding model (sentence-transformers MiniLM) are only
+imported the first time a lookup happens.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+# Sentence embedding model used when no embedder is configured
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "numpy is required for the semantic response cache. Install it with: pip install -e \".[semantic]\""
+        )
+    return numpy
+
+
+class SemanticCache:
+    """Responses indexed by prompt embeddings, grouped by conversation context.
+
+    Each context (a digest of the request parameters and every message before
+    the prompt) keeps a fixed-size matrix of unit-length prompt embeddings, so a
+    lookup is a single matrix-vector product. Once a context is full its oldest
+    prompt is overwritten; the least recently used contexts are dropped.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[Callable[[List[str]], Any]] = None,
+        max_contexts: int = 1024,
+        max_prompts: int = 256,
+    ):
+        """Initialize an empty cache.
+
+        Args:
+            embedder: Maps a list of texts to a list (or array) of vectors
+                (default: sentence-transformers MiniLM, loaded on first use)
+            max_contexts: Number of conversation contexts kept
+            max_prompts: Number of prompts kept per context
+        """
+        self.embedder = embedder
+        self.max_contexts = max_contexts
+        self.max_prompts = max_prompts
+        # context key -> [embeddings (max_prompts x dim), responses, stored count]
+        self._contexts: "OrderedDict[bytes, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._model = None
+
+    def _embed(self, text: str):
+        """Return the unit-length float32 embedding of ``text``."""
+        np = _require_numpy()
+        if self.embedder is not None:
+            vector = np.asarray(self.embedder([text])[0], dtype=np.float32)
+        else:
+            vector = np.asarray(self._default_model().encode([text])[0], dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _default_model(self):
+        if self._model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                raise ImportError(
+                    "sentence-transformers is required for the default semantic cache embedder. "
+                    "Install it with: pip install -e \".[semantic]\""
+                )
+            self._model = SentenceTransformer(DEFAULT_MODEL)
+        return self._model
+
+    def lookup(self, context: bytes, prompt: str, threshold: float) -> Tuple[Optional[str], Any]:
+        """Find the response to the most similar earlier prompt in ``context``.
+
+        Args:
+            context: Digest of the request parameters and preceding messages
+            prompt: Newest user prompt
+            threshold: Minimum cosine similarity for a hit
+
+        Returns:
+            Tuple of (cached response or None, prompt embedding); pass the
+            embedding to ``store`` on a miss so the prompt is embedded only once
+        """
+        query = self._embed(prompt)
+        with self._lock:
+            entry = self._contexts.get(context)
+            if entry is None:
+                return None, query
+            self._contexts.move_to_end(context)
+            embeddings, responses, count = entry
+            stored = min(count, self.max_prompts)
+            similarities = embeddings[:stored] @ query
+            best = int(similarities.argmax())
+            if similarities[best] >= threshold:
+                return responses[best], query
+        return None, query
+
+    def store(self, context: bytes, embedding: Any, response: str) -> None:
+        """Remember ``response`` for a prompt embedded by ``lookup``."""
+        np = _require_numpy()
+        with self._lock:
+            entry = self._contexts.get(context)
+            if entry is None:
+                entry = [
+                    np.zeros((self.max_prompts, embedding.shape[0]), dtype=np.float32),
+                    [None] * self.max_prompts,
+                    0,
+                ]
+                self._contexts[context] = entry
+                while len(self._contexts) > self.max_contexts:
+                    self._contexts.popitem(last=False)
+            else:
+                self._contexts.move_to_end(context)
+            slot = entry[2] % self.max_prompts
+            entry[0][slot] = embedding
+            entry[1][slot] = response
+            entry[2] += 1
+
+    def clear(self) -> None:
+        """Drop every stored prompt."""
+        with self._lock:
+            self._contexts.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(min(entry[2], self.max_prompts) for entry in self._contexts.values())
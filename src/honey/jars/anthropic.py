@@ -1,125 +1,288 @@
 """Anthropic jar implementation."""
 
-from typing import Optional, List, Dict
+from functools import lru_cache
+from typing import Any, AsyncIterator, Iterator, Optional, List, Dict
 
-from .base import Jar
+from .base import Jar, split_system_prompt
+from ._client_pool import get_httpx_async, get_httpx_sync
+
+# Marks the end of a prompt prefix that Anthropic should cache
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def _cached_text(text: str) -> List[Dict[str, Any]]:
+    """Wrap text as a content block carrying a cache breakpoint."""
+    return [{"type": "text", "text": text, "cache_control": _EPHEMERAL}]
+
+
+@lru_cache(maxsize=1024)
+def _system_block(text: str) -> List[Dict[str, Any]]:
+    """Return the process-wide cached system block for ``text``.
+    
+    Jars with the same system prompt (e.g. one per web request) share one
+    canonical block instead of building it on every request. The block is
+    shared and must not be mutated.
+    """
+    return _cached_text(text)
 
 
 class AnthropicJar(Jar):
     """Jar that uses Anthropic API for LLM execution."""
     
-    def __init__(self, model: str = "claude-3-5-sonnet-20241022", api_key: Optional[str] = None, system_prompt: Optional[str] = None, **kwargs):
+    def __init__(self, model: str = "claude-3-5-sonnet-20241022", api_key: Optional[str] = None, system_prompt: Optional[str] = None, prompt_caching: bool = True, **kwargs):
         """Initialize Anthropic jar.
         
         Args:
             model: Anthropic model to use (default: claude-3-5-sonnet-20241022)
             api_key: Anthropic API key (or set ANTHROPIC_API_KEY env var)
             system_prompt: Optional system prompt to set conversation context
+            prompt_caching: Mark the system prompt and recent user turns as cache
+                breakpoints so later turns reuse the cached conversation prefix
             **kwargs: Additional Anthropic API parameters (temperature, max_tokens, etc.)
         """
         super().__init__(system_prompt=system_prompt, model=model, api_key=api_key, **kwargs)
+        # The messages API requires max_tokens; default it once here rather than per request
+        self.config.setdefault('max_tokens', 4096)
+        self.prompt_caching = prompt_caching
+        self.cache_read_tokens = 0
+        self.cache_creation_tokens = 0
+        # (history version, request kwargs, prompt_caching, api kwargs) of the last
+        # request built from the jar's own history
+        self._prepared: Optional[tuple] = None
         self._client = None
         self._async_client = None
     
     def _get_client(self):
-        """Lazy load Anthropic sync client."""
+        """Lazy load Anthropic sync client (shared by jars with the same API key)."""
         if self._client is None:
             try:
                 from anthropic import Anthropic
-                self._client = Anthropic(api_key=self.config.get('api_key'))
             except ImportError:
                 raise ImportError(
                     "Anthropic package not installed. Install it with: pip install anthropic"
                 )
+            api_key = self.config.get('api_key')
+            self._client = self._shared_client(
+                ("anthropic", api_key),
+                lambda: Anthropic(api_key=api_key, http_client=get_httpx_sync()),
+            )
         return self._client
     
     def _get_async_client(self):
-        """Lazy load Anthropic async client."""
-        if self._async_client is None:
+        """Lazy load Anthropic async client (shared by jars with the same API key)."""
+        if self._async_client is None or self._is_closed(self._async_client):
             try:
                 from anthropic import AsyncAnthropic
-                self._async_client = AsyncAnthropic(api_key=self.config.get('api_key'))
             except ImportError:
                 raise ImportError(
                     "Anthropic package not installed. Install it with: pip install anthropic"
                 )
+            api_key = self.config.get('api_key')
+            self._async_client = self._shared_async_client(
+                ("anthropic", api_key),
+                lambda: AsyncAnthropic(api_key=api_key, http_client=get_httpx_async()),
+            )
         return self._async_client
     
-    def _prepare_messages(self) -> tuple[Optional[str], List[Dict[str, str]]]:
+    def _prepare_messages(self, history: Optional[List[Dict[str, str]]] = None) -> tuple[Optional[str], List[Dict[str, str]]]:
         """Prepare messages for Anthropic API (system prompt separate).
         
+        The jar's own history is already split as messages are added, so it is
+        returned without scanning or copying; callers must not mutate it.
+        
+        Args:
+            history: Conversation to prepare (defaults to the jar's history)
+        
         Returns:
             Tuple of (system_prompt, messages)
         """
-        system_prompt = None
-        messages = []
+        if history is None or history is self.history:
+            self._sync_history()
+            return self._system_prompt, self._messages
+        return split_system_prompt(history)
+    
+    def _build_api_kwargs(self, system_prompt: Optional[str], messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Build keyword arguments for the messages API from the jar config.
+        
+        With prompt caching enabled, the system prompt and the last two user turns
+        carry ``cache_control`` breakpoints: the newest one writes the whole
+        conversation to the cache, the previous one reads what the last turn wrote.
+        
+        Args:
+            system_prompt: System prompt, if any
+            messages: Conversation messages without the system prompt
+            
+        Returns:
+            Keyword arguments for ``messages.create`` / ``messages.stream``
+        """
+        api_kwargs = dict(self._request_kwargs())
         
-        for msg in self.history:
-            if msg["role"] == "system":
-                system_prompt = msg["content"]
-            else:
-                messages.append(msg)
+        # Snapshot the list: it may be the jar's live history, which concurrent
+        # calls keep appending to while this request is in flight
+        messages = list(messages)
+        api_kwargs['messages'] = messages
         
-        return system_prompt, messages
+        if not self.prompt_caching:
+            if system_prompt:
+                api_kwargs['system'] = system_prompt
+            return api_kwargs
+        
+        if system_prompt:
+            api_kwargs['system'] = _system_block(system_prompt)
+        
+        # Replace (rather than mutate) the marked turns, which are history entries
+        marked = 0
+        for i in range(len(messages) - 1, -1, -1):
+            if messages[i]["role"] == "user":
+                messages[i] = {"role": "user", "content": _cached_text(messages[i]["content"])}
+                marked += 1
+                if marked == 2:
+                    break
+        
+        return api_kwargs
     
-    def execute(self, prompt: str, **metadata) -> str:
-        """Execute prompt using Anthropic API synchronously."""
+    def _api_kwargs_for(self, history: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Build request arguments for a conversation.
+        
+        Arguments built from the jar's own history are reused until the history,
+        config or caching mode changes, so repeated requests for the same turn
+        (e.g. retries) skip the rebuild. Callers must not mutate the result.
+        
+        Args:
+            history: Conversation to send
+        
+        Returns:
+            Keyword arguments for ``messages.create`` / ``messages.stream``
+        """
+        if history is not self.history:
+            return self._build_api_kwargs(*self._prepare_messages(history))
+        
+        self._sync_history()
+        request_kwargs = self._request_kwargs()
+        prepared = self._prepared
+        if (
+            prepared is not None
+            and prepared[0] == self._history_version
+            and prepared[1] is request_kwargs
+            and prepared[2] == self.prompt_caching
+        ):
+            return prepared[3]
+        
+        api_kwargs = self._build_api_kwargs(*self._prepare_messages())
+        self._prepared = (self._history_version, request_kwargs, self.prompt_caching, api_kwargs)
+        return api_kwargs
+    
+    def _record_usage(self, usage: Any) -> None:
+        """Add a response's token usage, including cached prefix tokens, to the counters."""
+        cache_read = usage.cache_read_input_tokens or 0
+        cache_creation = usage.cache_creation_input_tokens or 0
+        self.cache_read_tokens += cache_read
+        self.cache_creation_tokens += cache_creation
+        self.total_tokens += usage.input_tokens + cache_read + cache_creation + usage.output_tokens
+    
+    def fork(self) -> 'AnthropicJar':
+        """Create a jar with a copy of this jar's configuration and history.
+        
+        Cache token counters start from zero, like ``total_tokens``.
+        
+        Returns:
+            New Anthropic jar sharing this jar's API clients
+        """
+        forked = super().fork()
+        forked.cache_read_tokens = 0
+        forked.cache_creation_tokens = 0
+        forked._prepared = None
+        return forked
+    
+    def clear_history(self):
+        """Clear the conversation history and reset counters."""
+        super().clear_history()
+        self.cache_read_tokens = 0
+        self.cache_creation_tokens = 0
+    
+    def _call(self, messages: List[Dict[str, str]]) -> str:
+        """Send a conversation to the Anthropic API synchronously."""
         client = self._get_client()
         
+        # Anthropic takes the system prompt separately from the messages
+        api_kwargs = self._api_kwargs_for(messages)
+        
+        response = client.messages.create(**api_kwargs)
+        self._record_usage(response.usage)
+        
+        return response.content[0].text
+    
+    def execute(self, prompt: str, **metadata) -> str:
+        """Execute prompt using Anthropic API synchronously."""
         # Add user message to history
         self.add_message("user", prompt)
         
-        # Prepare messages (Anthropic separates system prompts)
-        system_prompt, messages = self._prepare_messages()
+        assistant_message = self._respond(self.history)
+        self.add_message("assistant", assistant_message)
         
-        # Prepare API call
-        api_kwargs = {k: v for k, v in self.config.items() if k not in ['api_key']}
-        if 'max_tokens' not in api_kwargs:
-            api_kwargs['max_tokens'] = 4096
+        return assistant_message
+    
+    async def _acall(self, messages: List[Dict[str, str]]) -> str:
+        """Send a conversation to the Anthropic API asynchronously."""
+        client = self._get_async_client()
         
-        # Add system prompt if present
-        if system_prompt:
-            api_kwargs['system'] = system_prompt
+        # Anthropic takes the system prompt separately from the messages
+        api_kwargs = self._api_kwargs_for(messages)
         
-        response = client.messages.create(
-            messages=messages,
-            **api_kwargs
-        )
+        response = await client.messages.create(**api_kwargs)
+        self._record_usage(response.usage)
         
-        # Extract response and update state
-        assistant_message = response.content[0].text
+        return response.content[0].text
+    
+    async def aexecute(self, prompt: str, **metadata) -> str:
+        """Execute prompt using Anthropic API asynchronously."""
+        # Add user message to history
+        self.add_message("user", prompt)
+        
+        assistant_message = await self._arespond(self.history)
         self.add_message("assistant", assistant_message)
-        self.total_tokens += response.usage.input_tokens + response.usage.output_tokens
         
         return assistant_message
     
-    async def aexecute(self, prompt: str, **metadata) -> str:
-        """Execute prompt using Anthropic API asynchronously."""
-        client = self._get_async_client()
+    def stream(self, prompt: str, **metadata) -> Iterator[str]:
+        """Execute prompt using Anthropic streaming API, yielding text as it arrives."""
+        client = self._get_client()
         
         # Add user message to history
         self.add_message("user", prompt)
         
-        # Prepare messages (Anthropic separates system prompts)
-        system_prompt, messages = self._prepare_messages()
+        # Anthropic takes the system prompt separately from the messages
+        api_kwargs = self._api_kwargs_for(self.history)
         
-        # Prepare API call
-        api_kwargs = {k: v for k, v in self.config.items() if k not in ['api_key']}
-        if 'max_tokens' not in api_kwargs:
-            api_kwargs['max_tokens'] = 4096
+        chunks = []
+        with client.messages.stream(**api_kwargs) as stream:
+            for text in stream.text_stream:
+                chunks.append(text)
+                yield text
+            response = stream.get_final_message()
         
-        # Add system prompt if present
-        if system_prompt:
-            api_kwargs['system'] = system_prompt
+        # Record the full response once the stream is complete
+        self.add_message("assistant", "".join(chunks))
+        self._record_usage(response.usage)
+    
+    async def astream(self, prompt: str, **metadata) -> AsyncIterator[str]:
+        """Execute prompt using Anthropic streaming API, yielding text as it arrives."""
+        client = self._get_async_client()
+        
+        # Add user message to history
+        self.add_message("user", prompt)
         
-        response = await client.messages.create(
-            messages=messages,
-            **api_kwargs
-        )
+        # Anthropic takes the system prompt separately from the messages
+        api_kwargs = self._api_kwargs_for(self.history)
         
-        # Extract response and update state
-        assistant_message = response.content[0].text
-        self.add_message("assistant", assistant_message)
-        self.total_tokens += response.usage.input_tokens + response.usage.output_tokens
+        chunks = []
+        async with client.messages.stream(**api_kwargs) as stream:
+            async for text in stream.text_stream:
+                chunks.append(text)
+                yield text
+            response = await stream.get_final_message()
         
-        return assistant_message
+        # Record the full response once the stream is complete
+        assistant_message = "".join(chunks)
+        self.add_message("assistant", assistant_message)
+        self._record_usage(response.usage)
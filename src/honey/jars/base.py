@@ -4,19 +4,76 @@ Jars are reusable, stateful context managers that execute prompts against LLM AP
 They support both synchronous and asynchronous execution modes.
 """
 
+import asyncio
 import contextvars
-from typing import Optional, List, Dict
+import copy
+import hashlib
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Optional, List, Dict, Iterable, Iterator, Tuple
 from abc import ABC, abstractmethod
 
-# Context variables to track active jars (separate for sync and async)
-_sync_jar: contextvars.ContextVar[Optional['Jar']] = contextvars.ContextVar(
+from ..batch import gather_prompts
+from ._semantic_cache import SemanticCache
+
+# Context variables to track active jars (separate for sync and async). Each holds
+# a linked stack node, (jar, enclosing node), or None when no jar is active:
+# entering pushes a node and exiting restores the enclosing one. The stack lives
+# in the context rather than on the jar, so the same jar can be entered from
+# concurrent tasks (and nested) without any locking.
+_sync_jar: contextvars.ContextVar[Optional[tuple]] = contextvars.ContextVar(
     '_sync_jar', default=None
 )
-_async_jar: contextvars.ContextVar[Optional['Jar']] = contextvars.ContextVar(
+_async_jar: contextvars.ContextVar[Optional[tuple]] = contextvars.ContextVar(
     '_async_jar', default=None
 )
 
 
+def _pop_jar(var: contextvars.ContextVar, jar: 'Jar') -> None:
+    """Restore the node enclosing ``jar``'s, which must be the innermost one.
+    
+    Args:
+        var: Context variable holding the stack
+        jar: Jar whose context is being exited
+    
+    Raises:
+        RuntimeError: If ``jar`` is not the innermost active jar
+    """
+    node = var.get()
+    if node is None or node[0] is not jar:
+        active = "no jar" if node is None else f"{type(node[0]).__name__} {id(node[0]):#x}"
+        raise RuntimeError(
+            f"Exiting {type(jar).__name__} {id(jar):#x} context, but the innermost "
+            f"active jar in this context is {active}; jar contexts must be exited "
+            f"in reverse order of entry, from the context that entered them"
+        )
+    var.set(node[1])
+
+
+def split_system_prompt(history: List[Dict[str, str]]) -> Tuple[Optional[str], List[Dict[str, str]]]:
+    """Separate the system prompt from the other messages of a conversation.
+    
+    The non-system messages are collected in one comprehension; the system
+    prompt is then found from how many messages were left out, which is almost
+    always none or just the first one. The last system message wins.
+    
+    Args:
+        history: Conversation messages
+    
+    Returns:
+        Tuple of (system_prompt, messages)
+    """
+    messages = [msg for msg in history if msg["role"] != "system"]
+    skipped = len(history) - len(messages)
+    if not skipped:
+        return None, messages
+    if skipped == 1:
+        return next(msg["content"] for msg in history if msg["role"] == "system"), messages
+    return [msg["content"] for msg in history if msg["role"] == "system"][-1], messages
+
+
 class Jar(ABC):
     """Base class for LLM runtime jars.
     
@@ -24,24 +81,154 @@ class Jar(ABC):
     and execute prompts against LLM APIs in both sync and async modes.
     """
     
-    def __init__(self, system_prompt: Optional[str] = None, **config):
+    # SDK clients shared by every jar with the same provider and credentials.
+    # Async clients hold connections bound to an event loop, so they are cached
+    # per running loop and dropped together with it.
+    _client_cache: Dict[tuple, Any] = {}
+    _async_client_cache: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, Any]]" = weakref.WeakKeyDictionary()
+    _client_cache_lock = threading.Lock()
+    
+    # Config keys that set up the SDK client rather than being sent with requests
+    _client_config_keys = ('api_key',)
+    
+    # Responses shared by jars created with cache_responses=True, least recently
+    # used first, keyed by a digest of the jar type, endpoint, request parameters and messages
+    _response_cache: "OrderedDict[bytes, str]" = OrderedDict()
+    _response_cache_max = 1024
+    _response_cache_lock = threading.Lock()
+    _response_cache_hits = 0
+    _response_cache_misses = 0
+    # Near-duplicate prompts for jars created with semantic_threshold set
+    _semantic_cache = SemanticCache()
+    _semantic_hits = 0
+    
+    def __init__(
+        self,
+        system_prompt: Optional[str] = None,
+        cache_responses: bool = False,
+        semantic_threshold: Optional[float] = None,
+        **config
+    ):
         """Initialize jar with configuration.
         
         Args:
             system_prompt: Optional system prompt to set conversation context
+            cache_responses: Reuse earlier responses to identical conversations
+                (only while temperature is unset or 0)
+            semantic_threshold: With cache_responses, also reuse the response to
+                an earlier prompt whose embedding has at least this cosine
+                similarity to the new one (e.g. 0.97) after the same conversation
             **config: Runtime configuration (model, temperature, api_key, etc.)
         """
         self.config = config
+        self._model = config.get('model')
+        self.cache_responses = cache_responses
+        self.semantic_threshold = semantic_threshold
+        self._api_kwargs: Optional[Dict[str, Any]] = None
+        # The system prompt and non-system messages below are kept in step with
+        # history by add_message/add_system_prompt/clear_history; direct changes
+        # to history are detected by _sync_history (see there for its limits)
         self.history: List[Dict[str, str]] = []
+        self._system_prompt: Optional[str] = None
+        self._messages: List[Dict[str, str]] = []
+        # Length and last message of history as of the last tracked change
+        self._known_len = 0
+        self._known_last: Optional[Dict[str, str]] = None
+        # Bumped on every history change, so derived data can be memoized against it
+        self._history_version = 0
+        # Digest of history[:_digest_len], extended lazily for response cache keys
+        self._history_digest = hashlib.blake2b(digest_size=16)
+        self._digest_len = 0
+        # Digest of every message but the last, for semantic cache contexts
+        self._history_prefix_digest = self._history_digest.digest()
         self.total_tokens = 0
         self.message_count = 0
-        self._sync_token = None
-        self._async_token = None
         
         # Add system prompt if provided
         if system_prompt:
             self.add_message("system", system_prompt)
     
+    def update_config(self, **changes):
+        """Change runtime configuration (model, temperature, etc.).
+        
+        Prefer this over writing to ``config`` directly: request parameters are
+        derived from the config once and reused until it changes through here.
+        
+        Args:
+            **changes: Configuration values to set
+        """
+        self.config.update(changes)
+        self._invalidate_config_cache()
+    
+    def _invalidate_config_cache(self):
+        """Drop state derived from the config, after ``config`` was changed in place."""
+        self._model = self.config.get('model')
+        self._api_kwargs = None
+    
+    def _request_kwargs(self) -> Dict[str, Any]:
+        """Request parameters derived from the config, computed once per change.
+        
+        The returned dict is shared between calls and must not be mutated.
+        """
+        if self._api_kwargs is None:
+            self._api_kwargs = self._build_request_kwargs()
+        return self._api_kwargs
+    
+    def _build_request_kwargs(self) -> Dict[str, Any]:
+        """Compute request parameters from the config (see ``_request_kwargs``)."""
+        return {k: v for k, v in self.config.items() if k not in self._client_config_keys}
+    
+    @staticmethod
+    def _shared_client(key: tuple, factory: Callable[[], Any]) -> Any:
+        """Return the cached sync SDK client for ``key``, creating it on first use.
+        
+        Args:
+            key: Provider name plus whatever configures the client (API key, base URL)
+            factory: Builds the client on a cache miss
+        """
+        client = Jar._client_cache.get(key)
+        if client is None:
+            with Jar._client_cache_lock:
+                client = Jar._client_cache.get(key)
+                if client is None:
+                    client = Jar._client_cache[key] = factory()
+        return client
+    
+    @staticmethod
+    def _shared_async_client(key: tuple, factory: Callable[[], Any]) -> Any:
+        """Return the cached async SDK client for ``key`` on the running event loop.
+        
+        Outside a running loop the client is built without caching.
+        
+        Args:
+            key: Provider name plus whatever configures the client (API key, base URL)
+            factory: Builds the client on a cache miss
+        """
+        try:
+            clients = Jar._async_client_cache.setdefault(asyncio.get_running_loop(), {})
+        except (RuntimeError, TypeError):
+            return factory()
+        client = clients.get(key)
+        if client is None or Jar._is_closed(client):
+            client = clients[key] = factory()
+        return client
+    
+    @staticmethod
+    def _is_closed(client: Any) -> bool:
+        """Whether an SDK client's HTTP pool was closed, e.g. when its event loop shut down.
+        
+        Jars keep their async SDK client across calls, so a jar reused under a new
+        ``asyncio.run()`` checks this to fetch a client for the running loop.
+        """
+        return getattr(getattr(client, "_client", None), "is_closed", False) is True
+    
+    @classmethod
+    def reset_client_cache(cls) -> None:
+        """Forget all shared SDK clients (jars that already hold one keep it)."""
+        with Jar._client_cache_lock:
+            Jar._client_cache.clear()
+            Jar._async_client_cache.clear()
+    
     @abstractmethod
     def execute(self, prompt: str, **metadata) -> str:
         """Execute a prompt synchronously and return the LLM response.
@@ -68,24 +255,294 @@ class Jar(ABC):
         """
         pass
     
+    def _call(self, messages: List[Dict[str, str]]) -> str:
+        """Send a conversation to the LLM synchronously without recording it in history.
+        
+        Token usage is still added to ``total_tokens``.
+        
+        Args:
+            messages: Full conversation, ending with the user message to answer
+            
+        Returns:
+            The LLM response string
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement _call")
+    
+    async def _acall(self, messages: List[Dict[str, str]]) -> str:
+        """Send a conversation to the LLM without recording it in history.
+        
+        Token usage is still added to ``total_tokens``.
+        
+        Args:
+            messages: Full conversation, ending with the user message to answer
+            
+        Returns:
+            The LLM response string
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support aexecute_many")
+    
+    def _response_cache_key(self, messages: List[Dict[str, str]], prefix: bool = False) -> Optional[bytes]:
+        """Return the response cache key for a conversation, or None if it must not be cached.
+        
+        With ``prefix``, the key covers every message but the last one: the
+        context the semantic cache compares prompts within.
+        """
+        if not self.cache_responses or self.config.get('temperature') not in (None, 0):
+            return None
+        request = (
+            type(self).__name__,
+            self._model,
+            sorted(self._request_kwargs().items()),
+            # Client settings other than the key pick the endpoint (e.g. base_url)
+            [(k, self.config.get(k)) for k in self._client_config_keys if k != 'api_key'],
+        )
+        return hashlib.blake2b(
+            repr(request).encode() + self._messages_digest(messages, prefix), digest_size=16
+        ).digest()
+    
+    def _messages_digest(self, messages: List[Dict[str, str]], prefix: bool = False) -> bytes:
+        """Digest a conversation (without its last message, with ``prefix``).
+        
+        The jar's own history only hashes messages added since the last call.
+        """
+        if messages is self.history:
+            self._sync_history()
+            digest = self._history_digest
+            for msg in self.history[self._digest_len:]:
+                self._history_prefix_digest = digest.digest()
+                digest.update(repr((msg["role"], msg["content"])).encode())
+            self._digest_len = len(self.history)
+            return self._history_prefix_digest if prefix else digest.digest()
+        
+        digest = hashlib.blake2b(digest_size=16)
+        for msg in messages[:-1] if prefix else messages:
+            digest.update(repr((msg["role"], msg["content"])).encode())
+        return digest.digest()
+    
+    @staticmethod
+    def _cached_response(key: bytes) -> Optional[str]:
+        with Jar._response_cache_lock:
+            response = Jar._response_cache.get(key)
+            if response is None:
+                Jar._response_cache_misses += 1
+            else:
+                Jar._response_cache_hits += 1
+                Jar._response_cache.move_to_end(key)
+        return response
+    
+    @staticmethod
+    def _store_response(key: bytes, response: str) -> None:
+        with Jar._response_cache_lock:
+            Jar._response_cache[key] = response
+            Jar._response_cache.move_to_end(key)
+            while len(Jar._response_cache) > Jar._response_cache_max:
+                Jar._response_cache.popitem(last=False)
+    
+    @staticmethod
+    def _semantic_hit(response: Optional[str]) -> Optional[str]:
+        if response is not None:
+            with Jar._response_cache_lock:
+                Jar._semantic_hits += 1
+        return response
+    
+    def _respond(self, messages: List[Dict[str, str]]) -> str:
+        """Answer a conversation through ``_call``, using the response cache if enabled."""
+        key = self._response_cache_key(messages)
+        pending = None
+        if key is not None:
+            response = self._cached_response(key)
+            if response is None and self.semantic_threshold is not None:
+                context = self._response_cache_key(messages, prefix=True)
+                response, embedding = Jar._semantic_cache.lookup(
+                    context, messages[-1]["content"], self.semantic_threshold
+                )
+                response = self._semantic_hit(response)
+                pending = (context, embedding)
+            if response is not None:
+                return response
+        response = self._call(messages)
+        if key is not None:
+            self._store_response(key, response)
+            if pending is not None:
+                Jar._semantic_cache.store(*pending, response)
+        return response
+    
+    async def _arespond(self, messages: List[Dict[str, str]]) -> str:
+        """Answer a conversation through ``_acall``, using the response cache if enabled."""
+        key = self._response_cache_key(messages)
+        pending = None
+        if key is not None:
+            response = self._cached_response(key)
+            if response is None and self.semantic_threshold is not None:
+                # Embedding is CPU-bound, so it runs off the event loop
+                context = self._response_cache_key(messages, prefix=True)
+                response, embedding = await asyncio.to_thread(
+                    Jar._semantic_cache.lookup, context, messages[-1]["content"], self.semantic_threshold
+                )
+                response = self._semantic_hit(response)
+                pending = (context, embedding)
+            if response is not None:
+                return response
+        response = await self._acall(messages)
+        if key is not None:
+            self._store_response(key, response)
+            if pending is not None:
+                Jar._semantic_cache.store(*pending, response)
+        return response
+    
+    @classmethod
+    def clear_response_cache(cls) -> None:
+        """Drop all cached responses and reset the hit/miss counters."""
+        with Jar._response_cache_lock:
+            Jar._response_cache.clear()
+            Jar._response_cache_hits = 0
+            Jar._response_cache_misses = 0
+            Jar._semantic_hits = 0
+        Jar._semantic_cache.clear()
+    
+    @classmethod
+    def configure_semantic_cache(
+        cls,
+        embedder: Optional[Callable[[List[str]], Any]] = None,
+        max_contexts: int = 1024,
+        max_prompts: int = 256,
+    ) -> None:
+        """Replace the semantic cache shared by all jars, dropping its entries.
+        
+        Args:
+            embedder: Maps a list of texts to their embedding vectors
+                (default: sentence-transformers MiniLM, loaded on first use)
+            max_contexts: Number of conversation contexts kept
+            max_prompts: Number of prompts kept per context
+        """
+        Jar._semantic_cache = SemanticCache(embedder, max_contexts, max_prompts)
+    
+    @classmethod
+    def cache_stats(cls) -> Dict[str, int]:
+        """Report response cache usage.
+        
+        Returns:
+            Dictionary with exact 'hits', 'misses', current 'size' and the
+            'semantic_hits' among the misses
+        """
+        with Jar._response_cache_lock:
+            return {
+                "hits": Jar._response_cache_hits,
+                "misses": Jar._response_cache_misses,
+                "size": len(Jar._response_cache),
+                "semantic_hits": Jar._semantic_hits,
+            }
+    
+    async def aexecute_many(self, prompts: List[str], max_concurrency: int = 32, **metadata) -> List[str]:
+        """Execute independent prompts concurrently against the current history.
+        
+        Every prompt is answered as the next turn after the history as it was when
+        this method was called. History and ``message_count`` are not updated, so
+        the prompts do not see each other's responses; ``total_tokens`` is.
+        
+        Args:
+            prompts: Rendered prompt strings
+            max_concurrency: Maximum number of requests in flight at once
+            **metadata: Additional metadata (template, function name, etc.)
+            
+        Returns:
+            Responses in the same order as ``prompts``
+        """
+        snapshot = [dict(msg) for msg in self.history]
+        return await gather_prompts(
+            *(self._arespond(snapshot + [{"role": "user", "content": prompt}]) for prompt in prompts),
+            max_batch=max_concurrency,
+        )
+    
+    async def abatch(self, prompts: List[str], max_concurrency: int = 50, **metadata) -> List[str]:
+        """Execute independent prompts concurrently, then record them in history.
+        
+        Prompts are answered as in ``aexecute_many``, each against the history as
+        it was when this method was called. Once all have finished, every prompt
+        and its response are appended to history in prompt order.
+        
+        Args:
+            prompts: Rendered prompt strings
+            max_concurrency: Maximum number of requests in flight at once
+            **metadata: Additional metadata (template, function name, etc.)
+            
+        Returns:
+            Responses in the same order as ``prompts``
+        """
+        responses = await self.aexecute_many(prompts, max_concurrency=max_concurrency, **metadata)
+        self.extend_history(
+            turn
+            for prompt, response in zip(prompts, responses)
+            for turn in (("user", prompt), ("assistant", response))
+        )
+        return responses
+    
+    def execute_batch(self, prompts: List[str], **metadata) -> List[str]:
+        """Answer many prompts through the provider's offline batch API.
+        
+        Like ``aexecute_many``, each prompt continues the current history and the
+        responses are not added to it. Batch jobs trade latency (minutes to hours)
+        for lower cost and higher throughput.
+        
+        Args:
+            prompts: Rendered prompt strings
+            **metadata: Additional metadata (template, function name, etc.)
+            
+        Returns:
+            Responses in the same order as ``prompts``
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support execute_batch")
+    
+    def stream(self, prompt: str, **metadata) -> Iterator[str]:
+        """Execute a prompt synchronously, yielding the response in chunks.
+        
+        The default implementation yields the complete ``execute`` response as a
+        single chunk. Jars backed by a streaming API override this to yield text
+        as it arrives; the full response is added to history once it completes.
+        
+        Args:
+            prompt: The rendered prompt string
+            **metadata: Additional metadata (template, function name, etc.)
+            
+        Yields:
+            Chunks of the LLM response string
+        """
+        yield self.execute(prompt, **metadata)
+    
+    async def astream(self, prompt: str, **metadata) -> AsyncIterator[str]:
+        """Execute a prompt asynchronously, yielding the response in chunks.
+        
+        The default implementation yields the complete ``aexecute`` response as a
+        single chunk. Jars backed by a streaming API override this to yield text
+        as it arrives.
+        
+        Args:
+            prompt: The rendered prompt string
+            **metadata: Additional metadata (template, function name, etc.)
+            
+        Yields:
+            Chunks of the LLM response string
+        """
+        yield await self.aexecute(prompt, **metadata)
+    
     def __enter__(self):
         """Enter synchronous context."""
-        self._sync_token = _sync_jar.set(self)
+        _sync_jar.set((self, _sync_jar.get()))
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Exit synchronous context."""
-        _sync_jar.reset(self._sync_token)
+        _pop_jar(_sync_jar, self)
         return False
     
     async def __aenter__(self):
         """Enter asynchronous context."""
-        self._async_token = _async_jar.set(self)
+        _async_jar.set((self, _async_jar.get()))
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Exit asynchronous context."""
-        _async_jar.reset(self._async_token)
+        _pop_jar(_async_jar, self)
         return False
     
     def add_message(self, role: str, content: str):
@@ -95,19 +552,106 @@ class Jar(ABC):
             role: Message role ('user', 'assistant', 'system')
             content: Message content
         """
-        self.history.append({"role": role, "content": content})
+        self._sync_history()
+        # Roles from elsewhere (e.g. decoded JSON) are interned like the literals
+        # they are compared against, so those comparisons hit the identity check
+        msg = {"role": sys.intern(role), "content": content}
+        self.history.append(msg)
+        if role == "system":
+            self._system_prompt = content
+        else:
+            self._messages.append(msg)
+        self._history_version += 1
+        self._known_len += 1
+        self._known_last = msg
         self.message_count += 1
 
+    def extend_history(self, messages: Iterable[Tuple[str, str]]):
+        """Add several messages to the conversation history at once.
+        
+        Equivalent to calling ``add_message`` for each message, for replaying
+        conversations or tool-use turns in bulk.
+        
+        Args:
+            messages: (role, content) pairs in conversation order
+        """
+        self._sync_history()
+        new = [{"role": sys.intern(role), "content": content} for role, content in messages]
+        if not new:
+            return
+        self.history.extend(new)
+        for msg in new:
+            if msg["role"] == "system":
+                self._system_prompt = msg["content"]
+            else:
+                self._messages.append(msg)
+        self._history_version += 1
+        self._known_len += len(new)
+        self._known_last = new[-1]
+        self.message_count += len(new)
+    
     def add_system_prompt(self, content: str):
         """Add or update the system prompt at the start of history."""
         for msg in self.history:
             if msg["role"] == "system":
                 msg["content"] = content
+                self._reindex_history()
                 return
         # Ensure system prompt appears first in the conversation
         self.history.insert(0, {"role": "system", "content": content})
+        self._reindex_history()
         self.message_count += 1
     
+    def _reindex_history(self):
+        """Rebuild the state derived from history.
+        
+        ``add_message`` keeps it up to date incrementally; this is only needed
+        after history is replaced, reordered or edited in place. The last system
+        message wins.
+        """
+        self._history_version += 1
+        self._history_digest = hashlib.blake2b(digest_size=16)
+        self._digest_len = 0
+        self._history_prefix_digest = self._history_digest.digest()
+        self._system_prompt, self._messages = split_system_prompt(self.history)
+        self._known_len = len(self.history)
+        self._known_last = self.history[-1] if self.history else None
+    
+    def _sync_history(self):
+        """Rebuild the derived state if ``history`` was changed directly.
+        
+        Catches messages appended, removed or replaced (including
+        ``history.clear()`` or assigning a new list) by comparing the length
+        and the last message with the last tracked change. Editing a message's
+        content in place is not detected; call ``_reindex_history`` after that.
+        """
+        history = self.history
+        if len(history) != self._known_len or (history and history[-1] is not self._known_last):
+            self._reindex_history()
+    
+    def fork(self) -> 'Jar':
+        """Create a jar with a copy of this jar's configuration and history.
+        
+        The fork shares this jar's already-created API clients (and their HTTP
+        connection pools), so many independent conversations can run concurrently
+        without each constructing its own client. Its history and token count
+        evolve independently of the original.
+        
+        Returns:
+            New jar of the same type
+        """
+        forked = copy.copy(self)
+        forked.config = dict(self.config)
+        forked.history = [dict(msg) for msg in self.history]
+        forked._reindex_history()
+        forked.total_tokens = 0
+        return forked
+    
+    @property
+    def history_len(self) -> int:
+        """Number of messages in the history, without copying it like ``get_history``."""
+        return len(self.history)
+    
     def get_history(self) -> List[Dict[str, str]]:
         """Get the conversation history.
         
@@ -119,6 +663,7 @@ class Jar(ABC):
     def clear_history(self):
         """Clear the conversation history and reset counters."""
         self.history.clear()
+        self._reindex_history()
         self.message_count = 0
         self.total_tokens = 0
 
@@ -129,7 +674,8 @@ def get_active_jar() -> Optional[Jar]:
     Returns:
         Active jar instance or None
     """
-    return _sync_jar.get()
+    node = _sync_jar.get()
+    return node[0] if node is not None else None
 
 
 def get_active_async_jar() -> Optional[Jar]:
@@ -138,4 +684,5 @@ def get_active_async_jar() -> Optional[Jar]:
     Returns:
         Active jar instance or None
     """
-    return _async_jar.get()
+    node = _async_jar.get()
+    return node[0] if node is not None else None
@@ -1,8 +1,9 @@
 """Gemini jar implementation."""
 
-from typing import Optional, List, Dict
+import asyncio
+from typing import Any, AsyncIterator, Iterator, Optional, List, Dict
 
-from .base import Jar
+from .base import Jar, split_system_prompt
 
 
 class GeminiJar(Jar):
@@ -17,113 +18,262 @@ class GeminiJar(Jar):
             system_prompt: Optional system prompt to set conversation context
             **kwargs: Additional Gemini API parameters (temperature, max_tokens, etc.)
         """
+        # Non-system history in Gemini's format, extended as messages are added
+        self._gemini_history: List[Dict[str, Any]] = []
+        # Chat sessions continued across turns (see _reusable_chat)
+        self._chat_state: Optional[tuple] = None
+        self._async_chat_state: Optional[tuple] = None
         super().__init__(system_prompt=system_prompt, model=model, api_key=api_key, **kwargs)
         self._client = None
         self._async_client = None
     
     def _get_client(self):
-        """Lazy load Gemini sync client."""
+        """Lazy load Gemini sync client (shared by jars with the same API key)."""
         if self._client is None:
             try:
                 from google import genai
-                self._client = genai.Client(
-                    api_key=self.config.get("api_key")
-                )
             except ImportError:
                 raise ImportError(
                     "Google GenAI package not installed. Install it with: uv add google-genai"
                 )
+            api_key = self.config.get("api_key")
+            self._client = self._shared_client(
+                ("gemini", api_key),
+                lambda: genai.Client(api_key=api_key),
+            )
         return self._client
 
     def _get_async_client(self):
-        """Lazy load Gemini async client."""
+        """Lazy load Gemini async client (shared by jars with the same API key)."""
         if self._async_client is None:
             try:
                 from google import genai
-                self._async_client = genai.AsyncClient(
-                    api_key=self.config.get("api_key")
-                )
             except ImportError:
                 raise ImportError(
                     "Google GenAI package not installed. Install it with: uv add google-genai"
                 )
+            api_key = self.config.get("api_key")
+            self._async_client = self._shared_async_client(
+                ("gemini", api_key),
+                lambda: genai.AsyncClient(api_key=api_key),
+            )
         return self._async_client
     
-    def _prepare_gemini_history(self) -> tuple[Optional[str], List[Dict[str, str]]]:
+    @staticmethod
+    def _to_gemini(msg: Dict[str, str]) -> Dict[str, Any]:
+        """Convert a non-system history message to Gemini's content format."""
+        role = "model" if msg["role"] == "assistant" else "user"
+        return {"role": role, "parts": [msg["content"]]}
+    
+    def add_message(self, role: str, content: str):
+        """Add a message to the conversation history."""
+        super().add_message(role, content)
+        if role != "system":
+            self._gemini_history.append(self._to_gemini(self.history[-1]))
+    
+    def extend_history(self, messages):
+        """Add several messages to the conversation history at once."""
+        # Reindex any direct history edits first, so only the new messages are converted
+        self._sync_history()
+        known = len(self._messages)
+        super().extend_history(messages)
+        self._gemini_history.extend(self._to_gemini(msg) for msg in self._messages[known:])
+    
+    def _reindex_history(self):
+        """Rebuild the split history, including the Gemini-format messages."""
+        super()._reindex_history()
+        self._gemini_history = [self._to_gemini(msg) for msg in self._messages]
+        self._chat_state = None
+        self._async_chat_state = None
+    
+    def _reusable_chat(self, state: Optional[tuple], system_instruction: Optional[str]):
+        """Return the chat session from ``state`` if it can answer the newest turn.
+        
+        A session already holds every message up to its last reply, so it can be
+        continued when history has grown by exactly that reply and one new user
+        message since. Anything else (edits, failed or cached turns, concurrent
+        turns) starts a new session from history.
+        """
+        if state is None:
+            return None
+        chat, system, known, last_user = state
+        if (
+            system == system_instruction
+            and len(self._messages) == known + 1
+            and self._messages[known - 2] is last_user
+        ):
+            return chat
+        return None
+    
+    def _start_chat(self, client, system_instruction: Optional[str], chat_history: List[Dict[str, Any]]):
+        """Start a chat session seeded with history."""
+        chat_kwargs = {"history": chat_history}
+        if system_instruction:
+            chat_kwargs["system_instruction"] = system_instruction
+        return client.start_chat(**chat_kwargs)
+    
+    def _chat_for(self, client, messages: List[Dict[str, str]], state: Optional[tuple]) -> tuple:
+        """Return a chat session ready to send the last message of ``messages``.
+        
+        Continues this jar's session from ``state`` when possible; otherwise starts
+        one with the history before the last user message.
+        
+        Args:
+            client: Gemini client used to start a new session
+            messages: Conversation ending with the user message to send
+            state: Session state saved by the previous call of the same kind
+        
+        Returns:
+            Tuple of (chat, checkpoint); the checkpoint is the state to save once
+            the send succeeds, or None for conversations other than the jar's own
+        """
+        if messages is not self.history:
+            if len(messages) == 1:
+                # Single-shot prompts have no history or system prompt to convert
+                return self._start_chat(client, None, []), None
+            # Convert only the messages before the one being sent
+            system_instruction, chat_history = self._prepare_gemini_history(messages[:-1])
+            return self._start_chat(client, system_instruction, chat_history), None
+        
+        self._sync_history()
+        system_instruction = self._system_prompt
+        chat = self._reusable_chat(state, system_instruction)
+        if chat is None:
+            # The converted history is kept up to date by add_message, so a new
+            # session needs one copy of it without the message being sent
+            chat = self._start_chat(client, system_instruction, self._gemini_history[:-1])
+        # The session will also hold this turn's reply once it succeeds
+        return chat, (chat, system_instruction, len(self._messages) + 1, self._messages[-1])
+    
+    def _prepare_gemini_history(self, history: Optional[List[Dict[str, str]]] = None) -> tuple[Optional[str], List[Dict[str, Any]]]:
         """Prepare messages for Gemini API (system instruction separate).
         
+        The jar's own history is converted as messages are added, so it is
+        returned without rebuilding; callers must not mutate it.
+        
+        Args:
+            history: Conversation to prepare (defaults to the jar's history)
+        
         Returns:
             Tuple of (system_instruction, chat_history)
         """
-        system_instruction = None
-        chat_history = []
+        if history is None or history is self.history:
+            self._sync_history()
+            return self._system_prompt, self._gemini_history
+        system_instruction, messages = split_system_prompt(history)
+        to_gemini = self._to_gemini
+        return system_instruction, [to_gemini(msg) for msg in messages]
+    
+    def _record_usage(self, response: Any) -> None:
+        """Add a response's token usage to ``total_tokens``, if it reports any."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            self.total_tokens += usage.total_token_count
+    
+    def _call(self, messages: List[Dict[str, str]]) -> str:
+        """Send a conversation to the Gemini API synchronously."""
+        client = self._get_client()
         
-        for msg in self.history:
-            if msg["role"] == "system":
-                system_instruction = msg["content"]
-            elif msg["role"] == "assistant":
-                chat_history.append({"role": "model", "parts": [msg["content"]]})
-            else:  # user
-                chat_history.append({"role": "user", "parts": [msg["content"]]})
+        chat, checkpoint = self._chat_for(client, messages, self._chat_state)
         
-        return system_instruction, chat_history
+        # Send the current message
+        response = chat.send_message(messages[-1]["content"])
+        if checkpoint is not None:
+            self._chat_state = checkpoint
+        
+        self._record_usage(response)
+        
+        return response.text
     
     def execute(self, prompt: str, **metadata) -> str:
         """Execute prompt using Gemini API synchronously."""
-        client = self._get_client()
-        
         # Add user message to history
         self.add_message("user", prompt)
         
-        # Prepare messages
-        system_instruction, chat_history = self._prepare_gemini_history()
+        assistant_message = self._respond(self.history)
+        self.add_message("assistant", assistant_message)
         
-        # Start chat with history (excluding the last user message we just added)
-        # Include system_instruction if present
-        chat_kwargs = {"history": chat_history[:-1]}
-        if system_instruction:
-            chat_kwargs["system_instruction"] = system_instruction
-        chat = client.start_chat(**chat_kwargs)
+        return assistant_message
+    
+    async def _acall(self, messages: List[Dict[str, str]]) -> str:
+        """Send a conversation to the Gemini API asynchronously."""
+        client = self._get_async_client()
         
-        # Send the current message
-        response = chat.send_message(prompt)
+        chat, checkpoint = self._chat_for(client, messages, self._async_chat_state)
         
-        # Extract response and update state
-        assistant_message = response.text
-        self.add_message("assistant", assistant_message)
+        # Send the current message asynchronously. Sessions without an async method
+        # would block the event loop, so their sync call runs in a worker thread
+        send_message_async = getattr(chat, "send_message_async", None)
+        if send_message_async is not None:
+            response = await send_message_async(messages[-1]["content"])
+        else:
+            response = await asyncio.to_thread(chat.send_message, messages[-1]["content"])
+        if checkpoint is not None:
+            self._async_chat_state = checkpoint
         
-        # Gemini usage metadata
-        if hasattr(response, 'usage_metadata'):
-            self.total_tokens += response.usage_metadata.total_token_count
+        self._record_usage(response)
         
-        return assistant_message
+        return response.text
     
     async def aexecute(self, prompt: str, **metadata) -> str:
         """Execute prompt using Gemini API asynchronously."""
-        client = self._get_async_client()
+        # Add user message to history
+        self.add_message("user", prompt)
+        
+        assistant_message = await self._arespond(self.history)
+        self.add_message("assistant", assistant_message)
+        
+        return assistant_message
+    
+    def stream(self, prompt: str, **metadata) -> Iterator[str]:
+        """Execute prompt using Gemini streaming API, yielding text as it arrives."""
+        client = self._get_client()
         
         # Add user message to history
         self.add_message("user", prompt)
         
-        # Prepare messages
-        system_instruction, chat_history = self._prepare_gemini_history()
+        chat, checkpoint = self._chat_for(client, self.history, self._chat_state)
         
-        # Start chat with history (excluding the last user message we just added)
-        # Include system_instruction if present
-        chat_kwargs = {"history": chat_history[:-1]}
-        if system_instruction:
-            chat_kwargs["system_instruction"] = system_instruction
-        chat = client.start_chat(**chat_kwargs)
+        response = None
+        chunks = []
+        for response in chat.send_message(prompt, stream=True):
+            chunks.append(response.text)
+            yield response.text
+        self._chat_state = checkpoint
+        
+        # Record the full response once the stream is complete; the last chunk
+        # carries the usage for the whole reply
+        self.add_message("assistant", "".join(chunks))
+        if response is not None:
+            self._record_usage(response)
+    
+    async def astream(self, prompt: str, **metadata) -> AsyncIterator[str]:
+        """Execute prompt using Gemini streaming API, yielding text as it arrives."""
+        client = self._get_async_client()
         
-        # Send the current message asynchronously
-        response = await chat.send_message_async(prompt)
+        # Add user message to history
+        self.add_message("user", prompt)
         
-        # Extract response and update state
-        assistant_message = response.text
-        self.add_message("assistant", assistant_message)
+        chat, checkpoint = self._chat_for(client, self.history, self._async_chat_state)
         
-        # Gemini usage metadata
-        if hasattr(response, 'usage_metadata'):
-            self.total_tokens += response.usage_metadata.total_token_count
+        # Sessions without an async method cannot stream without blocking the
+        # event loop, so their full reply comes back from a worker thread
+        send_message_async = getattr(chat, "send_message_async", None)
+        if send_message_async is None:
+            response = await asyncio.to_thread(chat.send_message, prompt)
+            chunks = [response.text]
+            yield response.text
+        else:
+            response = None
+            chunks = []
+            async for response in await send_message_async(prompt, stream=True):
+                chunks.append(response.text)
+                yield response.text
+        self._async_chat_state = checkpoint
         
-        return assistant_message
+        # Record the full response once the stream is complete; the last chunk
+        # carries the usage for the whole reply
+        assistant_message = "".join(chunks)
+        self.add_message("assistant", assistant_message)
+        if response is not None:
+            self._record_usage(response)
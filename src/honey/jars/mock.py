@@ -1,21 +1,31 @@
 """Mock jar implementation for testing."""
 
+from typing import List, Dict
+
 from .base import Jar
 
 
 class MockJar(Jar):
     """Mock jar for testing - echoes back the prompt."""
     
+    def _call(self, messages: List[Dict[str, str]]) -> str:
+        """Return a mock response to the last message."""
+        return f"[MOCK RESPONSE]\nPrompt: {messages[-1]['content'][:100]}..."
+    
     def execute(self, prompt: str, **metadata) -> str:
         """Return a mock response."""
         self.add_message("user", prompt)
-        response = f"[MOCK RESPONSE]\nPrompt: {prompt[:100]}..."
+        response = self._respond(self.history)
         self.add_message("assistant", response)
         return response
     
+    async def _acall(self, messages: List[Dict[str, str]]) -> str:
+        """Return a mock response to the last message."""
+        return f"[ASYNC MOCK RESPONSE]\nPrompt: {messages[-1]['content'][:100]}..."
+    
     async def aexecute(self, prompt: str, **metadata) -> str:
         """Return a mock response asynchronously."""
         self.add_message("user", prompt)
-        response = f"[ASYNC MOCK RESPONSE]\nPrompt: {prompt[:100]}..."
+        response = await self._arespond(self.history)
         self.add_message("assistant", response)
         return response
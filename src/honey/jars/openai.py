@@ -1,90 +1,210 @@
 """OpenAI jar implementations."""
 
-from typing import Optional
-from unittest.mock import Mock
+import json
+import sys
+import time
+from typing import AsyncIterator, Iterator, List, Optional
 
 from .base import Jar
+from ._client_pool import get_httpx_async, get_httpx_sync
+
+try:
+    import orjson
+except ImportError:  # optional speedup for large batch payloads and results
+    orjson = None
+
+
+def _dumps(obj) -> bytes:
+    """Encode ``obj`` as compact JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _loads(data):
+    """Decode a JSON document, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class OpenAIBaseJar(Jar):
     """Base class for OpenAI-style APIs (OpenAI + compatible)."""
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # id(client) -> (client, supports responses API); see _supports_responses
+        self._responses_support = {}
+
     # ---------- capability detection ----------
 
     def _supports_responses(self, client) -> bool:
-        if isinstance(client, Mock):
+        # Clients never change shape, so the answer is worked out once per client
+        # (kept alongside the client so a reused id cannot match)
+        cached = self._responses_support.get(id(client))
+        if cached is not None and cached[0] is client:
+            return cached[1]
+
+        # Mocks answer every attribute, so only count responses set explicitly.
+        # A client cannot be a Mock unless unittest.mock is already imported
+        mock = sys.modules.get("unittest.mock")
+        if mock is not None and isinstance(client, mock.Mock):
             responses = client.__dict__.get("responses")
         else:
             responses = getattr(client, "responses", None)
-        return responses is not None and hasattr(responses, "create")
+        supported = responses is not None and hasattr(responses, "create")
+        self._responses_support[id(client)] = (client, supported)
+        return supported
 
     # ---------- shared kwargs ----------
 
+    # model is passed explicitly; api_key and base_url configure the client
+    _client_config_keys = ("api_key", "base_url", "model")
+
     def _call_kwargs(self, exclude=()):
+        if not exclude:
+            return self._request_kwargs()
         return {
-            k: v for k, v in self.config.items()
-            if k not in ("api_key", "base_url", "model", *exclude)
+            k: v for k, v in self._request_kwargs().items()
+            if k not in exclude
         }
 
     # ---------- sync ----------
 
-    def execute(self, prompt: str, **metadata) -> str:
+    def _call(self, messages):
         client = self._get_client()
-        self.add_message("user", prompt)
 
         if self._supports_responses(client):
             response = client.responses.create(
-                model=self.config["model"],
-                input=self.history,
+                model=self._model,
+                input=messages,
                 **self._call_kwargs()
             )
             assistant_message = response.output_text
             usage = response.usage
         else:
             response = client.chat.completions.create(
-                model=self.config["model"],
-                messages=self.history,
+                model=self._model,
+                messages=messages,
                 **self._call_kwargs()
             )
             assistant_message = response.choices[0].message.content
             usage = getattr(response, "usage", None)
 
-        self.add_message("assistant", assistant_message)
-
-        if usage:
+        if usage is not None:
             self.total_tokens += usage.total_tokens
 
         return assistant_message
 
+    def execute(self, prompt: str, **metadata) -> str:
+        self.add_message("user", prompt)
+        assistant_message = self._respond(self.history)
+        self.add_message("assistant", assistant_message)
+        return assistant_message
+
     # ---------- async ----------
 
-    async def aexecute(self, prompt: str, **metadata) -> str:
+    async def _acall(self, messages):
         client = self._get_async_client()
-        self.add_message("user", prompt)
 
         if self._supports_responses(client):
             response = await client.responses.create(
-                model=self.config["model"],
-                input=self.history,
+                model=self._model,
+                input=messages,
                 **self._call_kwargs()
             )
             assistant_message = response.output_text
             usage = response.usage
         else:
             response = await client.chat.completions.create(
-                model=self.config["model"],
-                messages=self.history,
+                model=self._model,
+                messages=messages,
                 **self._call_kwargs()
             )
             assistant_message = response.choices[0].message.content
             usage = getattr(response, "usage", None)
 
+        if usage is not None:
+            self.total_tokens += usage.total_tokens
+
+        return assistant_message
+
+    async def aexecute(self, prompt: str, **metadata) -> str:
+        self.add_message("user", prompt)
+        assistant_message = await self._arespond(self.history)
         self.add_message("assistant", assistant_message)
+        return assistant_message
+
+    # ---------- streaming ----------
+
+    def _stream_kwargs(self, responses_api: bool, messages) -> dict:
+        """Keyword arguments for a streaming request."""
+        if responses_api:
+            return dict(model=self._model, input=messages, stream=True, **self._call_kwargs())
+        return dict(
+            model=self._model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **self._call_kwargs()
+        )
 
-        if usage:
+    @staticmethod
+    def _stream_item(item, responses_api: bool) -> tuple:
+        """Return the (text, usage) carried by a stream event or chunk, either may be None."""
+        if responses_api:
+            if item.type == "response.output_text.delta":
+                return item.delta, None
+            if item.type == "response.completed":
+                return None, item.response.usage
+            return None, None
+        # The final chat chunk carries usage and no choices
+        text = item.choices[0].delta.content if item.choices else None
+        return text, getattr(item, "usage", None)
+
+    def _finish_stream(self, chunks, usage) -> None:
+        """Record a completed stream's response and usage."""
+        self.add_message("assistant", "".join(chunks))
+        if usage is not None:
             self.total_tokens += usage.total_tokens
 
-        return assistant_message
+    def stream(self, prompt: str, **metadata) -> Iterator[str]:
+        """Execute prompt with ``stream=True``, yielding text as it arrives."""
+        client = self._get_client()
+        self.add_message("user", prompt)
+        responses_api = self._supports_responses(client)
+        create = client.responses.create if responses_api else client.chat.completions.create
+
+        chunks = []
+        usage = None
+        for item in create(**self._stream_kwargs(responses_api, list(self.history))):
+            text, item_usage = self._stream_item(item, responses_api)
+            if text:
+                chunks.append(text)
+                yield text
+            if item_usage is not None:
+                usage = item_usage
+
+        self._finish_stream(chunks, usage)
+
+    async def astream(self, prompt: str, **metadata) -> AsyncIterator[str]:
+        """Execute prompt with ``stream=True``, yielding text as it arrives."""
+        client = self._get_async_client()
+        self.add_message("user", prompt)
+        responses_api = self._supports_responses(client)
+        create = client.responses.create if responses_api else client.chat.completions.create
+
+        chunks = []
+        usage = None
+        async for item in await create(**self._stream_kwargs(responses_api, list(self.history))):
+            text, item_usage = self._stream_item(item, responses_api)
+            if text:
+                chunks.append(text)
+                yield text
+            if item_usage is not None:
+                usage = item_usage
+
+        self._finish_stream(chunks, usage)
 
 
 class OpenAICompatibleJar(OpenAIBaseJar):
@@ -113,33 +233,45 @@ class OpenAICompatibleJar(OpenAIBaseJar):
         self._async_client = None
 
     def _get_client(self):
-        """Lazy load OpenAI-compatible sync client."""
+        """Lazy load OpenAI-compatible sync client (shared per API key and base URL)."""
         if self._client is None:
             try:
                 from openai import OpenAI
-                self._client = OpenAI(
-                    api_key=self.config["api_key"],
-                    base_url=self.config["base_url"],
-                )
             except ImportError:
                 raise ImportError(
                     "OpenAI package not installed. Install it with: pip install openai"
                 )
+            api_key = self.config["api_key"]
+            base_url = self.config["base_url"]
+            self._client = self._shared_client(
+                ("openai", api_key, base_url),
+                lambda: OpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    http_client=get_httpx_sync(),
+                ),
+            )
         return self._client
 
     def _get_async_client(self):
-        """Lazy load OpenAI-compatible async client."""
-        if self._async_client is None:
+        """Lazy load OpenAI-compatible async client (shared per API key and base URL)."""
+        if self._async_client is None or self._is_closed(self._async_client):
             try:
                 from openai import AsyncOpenAI
-                self._async_client = AsyncOpenAI(
-                    api_key=self.config["api_key"],
-                    base_url=self.config["base_url"],
-                )
             except ImportError:
                 raise ImportError(
                     "OpenAI package not installed. Install it with: pip install openai"
                 )
+            api_key = self.config["api_key"]
+            base_url = self.config["base_url"]
+            self._async_client = self._shared_async_client(
+                ("openai", api_key, base_url),
+                lambda: AsyncOpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    http_client=get_httpx_async(),
+                ),
+            )
         return self._async_client
 
 
@@ -159,29 +291,115 @@ class OpenAIJar(OpenAIBaseJar):
         self._async_client = None
 
     def _get_client(self):
-        """Lazy load OpenAI sync client."""
+        """Lazy load OpenAI sync client (shared by jars with the same API key)."""
         if self._client is None:
             try:
                 from openai import OpenAI
-                self._client = OpenAI(api_key=self.config.get("api_key"))
             except ImportError:
                 raise ImportError(
                     "OpenAI package not installed. Install it with: pip install openai"
                 )
+            api_key = self.config.get("api_key")
+            self._client = self._shared_client(
+                ("openai", api_key, None),
+                lambda: OpenAI(api_key=api_key, http_client=get_httpx_sync()),
+            )
         return self._client
 
     def _get_async_client(self):
-        """Lazy load OpenAI async client."""
-        if self._async_client is None:
+        """Lazy load OpenAI async client (shared by jars with the same API key)."""
+        if self._async_client is None or self._is_closed(self._async_client):
             try:
                 from openai import AsyncOpenAI
-                self._async_client = AsyncOpenAI(api_key=self.config.get("api_key"))
             except ImportError:
                 raise ImportError(
                     "OpenAI package not installed. Install it with: pip install openai"
                 )
+            api_key = self.config.get("api_key")
+            self._async_client = self._shared_async_client(
+                ("openai", api_key, None),
+                lambda: AsyncOpenAI(api_key=api_key, http_client=get_httpx_async()),
+            )
         return self._async_client
 
+    def execute_batch(
+        self,
+        prompts: List[str],
+        completion_window: str = "24h",
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+        **metadata
+    ) -> List[str]:
+        """Answer many prompts through the OpenAI Batch API.
+        
+        Uploads one chat completion request per prompt, polls the batch with
+        exponential backoff until it finishes and returns the responses in prompt
+        order. Batch requests cost half as much as realtime ones.
+        
+        Args:
+            prompts: Rendered prompt strings
+            completion_window: Time window the batch must complete in
+            poll_interval: Seconds before the first status check
+            max_poll_interval: Upper bound for the delay between checks
+            **metadata: Additional metadata (template, function name, etc.)
+            
+        Returns:
+            Responses in the same order as ``prompts``
+        
+        Raises:
+            RuntimeError: If the batch, or any request in it, does not complete
+        """
+        if not prompts:
+            return []
+        client = self._get_client()
+        
+        # Every request repeats the request parameters and history, so encode them
+        # once and splice in only the prompt: (P + N) rather than P * N encoding
+        body = _dumps({"model": self._model, **self._call_kwargs()})[:-1]
+        history = b"".join(_dumps(msg) + b"," for msg in self.history)
+        lines = [
+            b'{"custom_id":"%d","method":"POST","url":"/v1/chat/completions","body":%s,"messages":[%s%s]}}'
+            % (i, body, history, _dumps({"role": "user", "content": prompt}))
+            for i, prompt in enumerate(prompts)
+        ]
+        input_file = client.files.create(
+            file=("batch.jsonl", b"\n".join(lines)),
+            purpose="batch",
+        )
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=completion_window,
+        )
+        
+        delay = poll_interval
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+            batch = client.batches.retrieve(batch.id)
+        if batch.status != "completed":
+            raise RuntimeError(f"OpenAI batch {batch.id} ended with status {batch.status!r}")
+        
+        responses: List[Optional[str]] = [None] * len(prompts)
+        if batch.output_file_id:
+            for line in client.files.content(batch.output_file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                result = _loads(line)
+                response = result.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                completion = response["body"]
+                responses[int(result["custom_id"])] = completion["choices"][0]["message"]["content"]
+                usage = completion.get("usage")
+                if usage:
+                    self.total_tokens += usage["total_tokens"]
+        
+        failed = [i for i, response in enumerate(responses) if response is None]
+        if failed:
+            raise RuntimeError(f"OpenAI batch {batch.id} has no response for prompts {failed}")
+        return responses
+
 
 class OpenAIClientJar(OpenAIJar):
     """OpenAI jar that accepts pre-initialized clients."""
@@ -14,29 +14,59 @@ Usage:
     result = summarize(text="This is long text that needs to be summarized")
 """
 
+import os
 import sys
 import re
+import marshal
+from functools import lru_cache
 from pathlib import Path
 from importlib.abc import MetaPathFinder, Loader
-from importlib.machinery import ModuleSpec
-from types import ModuleType
-from typing import Optional, Dict, Any
+from importlib.machinery import ModuleSpec, PathFinder
+from types import CodeType, ModuleType
+from typing import Optional, Dict, Any, AsyncIterator, Callable, FrozenSet, Iterator, Tuple
+
+from .jars.base import get_active_jar, get_active_async_jar
 
 try:
-    from jinja2 import Template
+    import jinja2
+    from jinja2 import Environment, Template
+    
+    # Shared environment for every prompt template. No bytecode_cache is set:
+    # Jinja only consults it for templates fetched through a loader, never for
+    # from_string/compile, so compiled code is persisted in __hnycache__ instead
+    _env = Environment(auto_reload=False, optimized=True)
+    _JINJA_VERSION = jinja2.__version__
 except ImportError:
+    _env = None
+    _JINJA_VERSION = None
+    
     # Fallback to simple string formatting if jinja2 is not available
     class Template:
+        _VARIABLE_RE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+        
         def __init__(self, template_str):
             self.template_str = template_str
         
         def render(self, **kwargs):
-            # Simple {{variable}} replacement
-            result = self.template_str
-            for key, value in kwargs.items():
-                result = result.replace("{{" + key + "}}", str(value))
-                result = result.replace("{{ " + key + " }}", str(value))
-            return result
+            # Simple {{variable}} replacement in a single pass; unknown names are left as-is
+            def substitute(match):
+                name = match.group(1)
+                return str(kwargs[name]) if name in kwargs else match.group(0)
+            return self._VARIABLE_RE.sub(substitute, self.template_str)
+
+
+# Separator between prompts: a line of 3 or more dashes. Spelling out the first
+# three dashes gives the regex engine a literal prefix to scan for.
+_SEPARATOR_RE = re.compile(r'\n---+\n')
+
+
+def _iter_sections(content: str) -> Iterator[str]:
+    """Yield the raw text between separator lines without building a list."""
+    pos = 0
+    for match in _SEPARATOR_RE.finditer(content):
+        yield content[pos:match.start()]
+        pos = match.end()
+    yield content[pos:]
 
 
 def parse_hny_file(filepath: Path) -> Dict[str, str]:
@@ -57,50 +87,224 @@ def parse_hny_file(filepath: Path) -> Dict[str, str]:
     Returns:
         Dictionary mapping prompt names to their template strings
     """
-    content = filepath.read_text(encoding='utf-8')
+    return parse_hny_source(filepath.read_text(encoding='utf-8'))
+
+
+def parse_hny_source(content: str) -> Dict[str, str]:
+    """Parse .hny source text into a dictionary of prompt name -> template content.
     
-    # Split by separator lines (3 or more dashes)
-    sections = re.split(r'\n-{3,}\n', content)
+    See ``parse_hny_file`` for the format.
     
+    Args:
+        content: Text of a .hny file
+        
+    Returns:
+        Dictionary mapping prompt names to their template strings
+    """
     prompts = {}
-    for section in sections:
+    for section in _iter_sections(content):
         section = section.strip()
         if not section:
             continue
-            
-        # Split into first line (name) and rest (template)
-        lines = section.split('\n', 1)
-        if len(lines) < 2:
-            # If only one line, treat it as name with empty template
-            name = lines[0].strip()
-            template = ""
-        else:
-            name = lines[0].strip()
-            template = lines[1].strip()
         
+        # First line is the name, the rest is the template (empty if only one line)
+        name, _, template = section.partition('\n')
+        name = name.strip()
         if name:
-            prompts[name] = template
+            prompts[name] = template.strip()
     
     return prompts
 
 
-def create_prompt_function(template_str: str):
-    """Create a callable function that renders a Jinja2 template.
-    
-    When called within a jar context, the function executes the prompt with the LLM.
-    When called outside a jar context, it returns the rendered template string.
+@lru_cache(maxsize=4096)
+def _compile_code(template_str: str) -> CodeType:
+    """Compile a template string to the Python code object Jinja2 renders from."""
+    return _env.compile(template_str)
+
+
+def _template_from_code(code: CodeType) -> Template:
+    """Create a template from code produced by ``_compile_code``."""
+    return _env.template_class.from_code(_env, code, _env.make_globals(None))
+
+
+@lru_cache(maxsize=4096)
+def _compile_template(template_str: str) -> Template:
+    """Compile a template string, reusing the result for identical sources.
     
     Args:
         template_str: The Jinja2 template string
         
     Returns:
-        A runtime-aware function that accepts keyword arguments
+        Compiled template object
+    """
+    if _env is None:
+        return Template(template_str)
+    return _template_from_code(_compile_code(template_str))
+
+
+# Compiled templates are cached next to the source, like __pycache__/*.pyc
+_CACHE_DIR = '__hnycache__'
+_CACHE_MAGIC = 'hnyc1'
+
+
+def _cache_path(filepath: Path) -> Optional[Path]:
+    """Return the .hnyc cache file for a .hny file, or None if caching is unavailable."""
+    tag = sys.implementation.cache_tag
+    if _env is None or tag is None:
+        return None
+    return filepath.parent / _CACHE_DIR / f"{filepath.stem}.{tag}.hnyc"
+
+
+def _cache_header(st: os.stat_result) -> Tuple[str, str, int, int]:
+    """Header identifying the source and Jinja2 version a cache entry was built from."""
+    return (_CACHE_MAGIC, _JINJA_VERSION, st.st_mtime_ns, st.st_size)
+
+
+def _read_hny_cache(filepath: Path, st: os.stat_result) -> Optional[Dict[str, Tuple[str, CodeType]]]:
+    """Load compiled templates for a .hny file if an up-to-date cache exists.
+    
+    Args:
+        filepath: Path to the .hny file
+        st: Current stat result of the .hny file
+        
+    Returns:
+        Dictionary mapping prompt names to (template source, code), or None
+    """
+    cache_path = _cache_path(filepath)
+    if cache_path is None:
+        return None
+    
+    try:
+        header, prompts = marshal.loads(cache_path.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    
+    if header != _cache_header(st):
+        return None
+    return prompts
+
+
+def _write_hny_cache(filepath: Path, st: os.stat_result, prompts: Dict[str, str]) -> None:
+    """Write compiled templates for a .hny file to its cache (best effort).
+    
+    Args:
+        filepath: Path to the .hny file
+        st: Stat result of the .hny file when it was parsed
+        prompts: Dictionary mapping prompt names to template strings
+    """
+    cache_path = _cache_path(filepath)
+    if cache_path is None or sys.dont_write_bytecode:
+        return
+    
+    compiled = {name: (source, _compile_code(source)) for name, source in prompts.items()}
+    data = marshal.dumps((_cache_header(st), compiled))
+    
+    # Write to a temporary file and rename so readers never see a partial cache
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Unwritable directories just mean no cache
+        pass
+
+
+def _make_renderer(template: Template) -> Callable[[Dict[str, Any]], str]:
+    """Return a function that renders ``template`` from a dict of variables.
+    
+    Jinja2 templates are rendered by calling their compiled root function
+    directly, skipping the argument handling ``Template.render`` does per call.
+    """
+    if _env is None or not isinstance(template, _env.template_class):
+        return lambda kwargs: template.render(**kwargs)
+    
+    root = template.root_render_func
+    new_context = template.new_context
+    concat = _env.concat
+    
+    def render(kwargs: Dict[str, Any]) -> str:
+        try:
+            return concat(root(new_context(kwargs)))
+        except Exception:
+            # Re-raises with the traceback pointing at the template source
+            _env.handle_exception()
+    
+    return render
+
+
+# Values whose renders can be memoized: immutable, and compared by value
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _type_key(value: Any) -> Any:
+    """Return the types making up an immutable scalar (or tuple of them), else None.
+    
+    Values that compare equal but render differently (``1``, ``True``, ``1.0``)
+    get different type keys, so they never share a memoized render.
     """
-    from . import jars  # Import here to avoid circular dependency
+    cls = type(value)
+    if cls in _SCALAR_TYPES:
+        return cls
+    if cls is tuple:
+        types = tuple(_type_key(item) for item in value)
+        if None not in types:
+            return types
+    return None
+
+
+async def _single_chunk(text: str) -> AsyncIterator[str]:
+    """Yield ``text`` as the only chunk of an async stream."""
+    yield text
+
+
+class PromptFunction:
+    # A callable prompt template; instances are the functions exposed by .hny modules.
+    # There is no class docstring because __doc__ is a per-instance slot.
+    __slots__ = ('template', '__template__', '__doc__', '_render_template', '_cached_render')
     
-    template = Template(template_str)
+    def __init__(self, template_str: str, template: Template, cache_size: int = 0):
+        """Initialize the prompt function.
+        
+        Args:
+            template_str: The Jinja2 template string
+            template: Compiled template for ``template_str``
+            cache_size: Number of renders to memoize (0, the default, disables)
+        """
+        self.template = template
+        self.__template__ = template_str
+        self.__doc__ = f"Render prompt template:\n\n{template_str[:200]}{'...' if len(template_str) > 200 else ''}"
+        
+        render = _make_renderer(template)
+        self._render_template = render
+        if cache_size > 0:
+            self._cached_render = lru_cache(maxsize=cache_size)(
+                lambda items: render({name: value for name, _, value in items})
+            )
+        else:
+            self._cached_render = None
+    
+    def _render(self, kwargs: Dict[str, Any]) -> str:
+        """Render the template, reusing the previous result for identical arguments."""
+        if self._cached_render is not None:
+            items = []
+            for name, value in kwargs.items():
+                type_key = _type_key(value)
+                if type_key is None:
+                    # Other objects may change between calls, so they are rendered every time
+                    return self._render_template(kwargs)
+                items.append((name, type_key, value))
+            # Keyword names are unique, so sorting never compares the values
+            items.sort()
+            return self._cached_render(tuple(items))
+        return self._render_template(kwargs)
+    
+    def cache_clear(self):
+        """Discard memoized renders."""
+        if self._cached_render is not None:
+            self._cached_render.cache_clear()
     
-    def prompt_function(**kwargs):
+    def __call__(self, **kwargs):
         """Render the prompt template with the provided variables.
         
         When inside a jar context, executes the prompt with the LLM and returns the response.
@@ -115,37 +319,80 @@ def create_prompt_function(template_str: str):
             Rendered prompt string, LLM response, or awaitable coroutine
         """
         # Render the template
-        rendered_prompt = template.render(**kwargs)
+        rendered_prompt = self._render(kwargs)
         
         # Check for active jar contexts
-        sync_jar = jars.get_active_jar()
-        async_jar = jars.get_active_async_jar()
-        
+        async_jar = get_active_async_jar()
         if async_jar is not None:
-            # Return a coroutine for async context
-            async def execute_async():
-                return await async_jar.aexecute(
-                    rendered_prompt,
-                    template=template_str,
-                    kwargs=kwargs
-                )
-            return execute_async()
-        elif sync_jar is not None:
+            # Return the coroutine for the caller to await
+            return async_jar.aexecute(
+                rendered_prompt,
+                template=self.__template__,
+                kwargs=kwargs
+            )
+        
+        sync_jar = get_active_jar()
+        if sync_jar is not None:
             # Execute synchronously
             return sync_jar.execute(
                 rendered_prompt,
-                template=template_str,
+                template=self.__template__,
                 kwargs=kwargs
             )
-        else:
-            # No jar context - return rendered template
-            return rendered_prompt
+        
+        # No jar context - return rendered template
+        return rendered_prompt
     
-    # Store the template string as an attribute for inspection
-    prompt_function.__template__ = template_str
-    prompt_function.__doc__ = f"Render prompt template:\n\n{template_str[:200]}{'...' if len(template_str) > 200 else ''}"
+    def stream(self, **kwargs) -> AsyncIterator[str]:
+        """Render the prompt and stream the response from the active async jar.
+        
+        Outside an async jar context, yields the rendered prompt as a single chunk.
+        
+        Args:
+            **kwargs: Template variables to render
+            
+        Returns:
+            Async iterator over response chunks
+        """
+        rendered_prompt = self._render(kwargs)
+        async_jar = get_active_async_jar()
+        
+        if async_jar is not None:
+            return async_jar.astream(
+                rendered_prompt,
+                template=self.__template__,
+                kwargs=kwargs
+            )
+        return _single_chunk(rendered_prompt)
+
+
+def create_prompt_function(
+    template_str: str,
+    template: Optional[Template] = None,
+    cache_size: int = 0,
+) -> PromptFunction:
+    """Create a callable function that renders a Jinja2 template.
+    
+    When called within a jar context, the function executes the prompt with the LLM.
+    When called outside a jar context, it returns the rendered template string.
     
-    return prompt_function
+    With ``cache_size`` set, renders are memoized per set of keyword arguments
+    when every argument is a string, number, bool, None or tuple of those; other
+    arguments are rendered on every call. Only enable it for templates whose
+    output depends on nothing but their arguments (not ``|random``, ``lipsum``
+    or globals that change).
+    
+    Args:
+        template_str: The Jinja2 template string
+        template: Already compiled template for ``template_str`` (compiled if omitted)
+        cache_size: Number of renders to memoize (0, the default, disables the render cache)
+        
+    Returns:
+        A runtime-aware function that accepts keyword arguments
+    """
+    if template is None:
+        template = _compile_template(template_str)
+    return PromptFunction(template_str, template, cache_size)
 
 
 class HnyLoader(Loader):
@@ -153,29 +400,97 @@ class HnyLoader(Loader):
     
     def __init__(self, filepath: Path):
         self.filepath = filepath
+        # (mtime_ns, size) of the source -> prompt name -> (template string, compiled template)
+        self._parsed: Optional[Tuple[Tuple[int, int], Dict[str, Tuple[str, Template]]]] = None
     
     def create_module(self, spec: ModuleSpec) -> Optional[ModuleType]:
         """Return None to use default module creation."""
         return None
     
-    def exec_module(self, module: ModuleType) -> None:
-        """Execute the module by parsing .hny file and creating prompt functions."""
-        # Parse the .hny file
+    def _load_templates(self, st: os.stat_result) -> Dict[str, Tuple[str, Template]]:
+        """Compile the file's prompts, reusing the ``__hnycache__`` entry when valid."""
+        cached = _read_hny_cache(self.filepath, st)
+        if cached is not None:
+            return {
+                name: (template_str, _template_from_code(code))
+                for name, (template_str, code) in cached.items()
+            }
+        
+        # Parse the .hny file and compile each prompt
         prompts = parse_hny_file(self.filepath)
+        templates = {
+            name: (template_str, _compile_template(template_str))
+            for name, template_str in prompts.items()
+        }
+        _write_hny_cache(self.filepath, st, prompts)
+        return templates
+    
+    def exec_module(self, module: ModuleType) -> None:
+        """Execute the module by parsing .hny file and creating prompt functions.
         
-        # Create a function for each prompt and add to module
-        for name, template_str in prompts.items():
-            func = create_prompt_function(template_str)
+        Compiled templates are reused from the ``__hnycache__`` directory when the
+        source is unchanged, skipping parsing and Jinja2 compilation. Reloading the
+        module through the same loader reuses the templates held in memory.
+        """
+        st = os.stat(self.filepath)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._parsed is None or self._parsed[0] != stamp:
+            self._parsed = (stamp, self._load_templates(st))
+        
+        functions = {
+            name: create_prompt_function(template_str, template, _render_cache_size)
+            for name, (template_str, template) in self._parsed[1].items()
+        }
+        
+        # Add a function for each prompt to the module
+        for name, func in functions.items():
             setattr(module, name, func)
         
         # Add metadata
         module.__file__ = str(self.filepath)
-        module.__prompts__ = list(prompts.keys())
+        module.__prompts__ = list(functions.keys())
 
 
 class HnyFinder(MetaPathFinder):
     """Finder for .hny files on sys.path."""
     
+    def __init__(self):
+        # Directory -> (mtime, names of .hny modules it contains)
+        self._dir_cache: Dict[str, Tuple[int, FrozenSet[str]]] = {}
+        # One loader per file, so repeated finds (reloads) share its parsed templates
+        self._loaders: Dict[Path, HnyLoader] = {}
+    
+    def _hny_names(self, directory: str) -> FrozenSet[str]:
+        """Return the .hny module names in a directory, cached until its mtime changes."""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return frozenset()
+        
+        cached = self._dir_cache.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        try:
+            names = frozenset(
+                entry[:-4] for entry in os.listdir(directory) if entry.endswith('.hny')
+            )
+        except OSError:
+            names = frozenset()
+        self._dir_cache[directory] = (mtime, names)
+        return names
+    
+    def invalidate_caches(self, directory: Optional[str] = None) -> None:
+        """Drop cached directory listings (called by importlib.invalidate_caches).
+        
+        Args:
+            directory: Only forget this directory's listing (default: all)
+        """
+        if directory is None:
+            self._dir_cache.clear()
+        else:
+            self._dir_cache.pop(directory, None)
+    
     def find_spec(self, fullname: str, path: Optional[list] = None, target: Optional[ModuleType] = None) -> Optional[ModuleSpec]:
         """Try to find a .hny file matching the module name.
         
@@ -197,17 +512,20 @@ class HnyFinder(MetaPathFinder):
         else:
             search_paths = path
         
-        # Look for .hny file
+        # Look for .hny file ('' on sys.path means the current directory)
         for search_path in search_paths:
-            search_dir = Path(search_path)
-            if not search_dir.exists():
+            directory = os.fspath(search_path) or '.'
+            if module_name not in self._hny_names(directory):
                 continue
-                
-            hny_file = search_dir / f"{module_name}.hny"
-            if hny_file.exists() and hny_file.is_file():
+            
+            hny_file = Path(directory) / f"{module_name}.hny"
+            if hny_file.is_file():
+                hny_loader = self._loaders.get(hny_file)
+                if hny_loader is None:
+                    hny_loader = self._loaders[hny_file] = HnyLoader(hny_file)
                 return ModuleSpec(
                     name=fullname,
-                    loader=HnyLoader(hny_file),
+                    loader=hny_loader,
                     origin=str(hny_file),
                     is_package=False
                 )
@@ -218,15 +536,33 @@ class HnyFinder(MetaPathFinder):
 # Global finder instance
 _finder = HnyFinder()
 
+# Renders memoized per prompt function of modules imported from .hny files
+_render_cache_size = 0
+
 
-def install():
+def install(render_cache_size: Optional[int] = None):
     """Install the .hny file loader into Python's import system.
     
     This should be called once at the start of your program, before importing
     any .hny files.
+    
+    Args:
+        render_cache_size: Number of renders each prompt function of .hny modules
+            imported afterwards memoizes (see ``create_prompt_function``); leaves
+            the current setting (initially 0, no memoization) when omitted
     """
+    global _render_cache_size
+    if render_cache_size is not None:
+        _render_cache_size = render_cache_size
     if _finder not in sys.meta_path:
-        sys.meta_path.insert(0, _finder)
+        # Sit just ahead of the sys.path finder: .hny files still take
+        # precedence over .py files, but built-in and frozen modules are
+        # resolved without consulting us
+        try:
+            index = sys.meta_path.index(PathFinder)
+        except ValueError:
+            index = len(sys.meta_path)
+        sys.meta_path.insert(index, _finder)
 
 
 def uninstall():
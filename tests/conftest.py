@@ -1,18 +1,19 @@
 """Shared pytest fixtures for honey tests."""
 
+import asyncio
 import sys
 import pytest
 from pathlib import Path
 from typing import Generator
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def fixtures_dir() -> Path:
     """Path to test fixtures directory."""
     return Path(__file__).parent / "fixtures"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def prompts_dir(fixtures_dir) -> Path:
     """Path to test prompt fixtures."""
     return fixtures_dir / "prompts"
@@ -22,13 +23,13 @@ def prompts_dir(fixtures_dir) -> Path:
 def temp_hny_file(tmp_path):
     """Create a temporary .hny file with custom content.
     
-    Automatically adds tmp_path to sys.path and invalidates import caches.
+    Automatically adds tmp_path to sys.path and invalidates its import caches.
     
     Usage:
         def test_something(temp_hny_file):
             hny_path = temp_hny_file("content", "module_name.hny")
     """
-    import importlib
+    from honey import loader
     
     # Add tmp_path to sys.path so .hny files can be found
     if str(tmp_path) not in sys.path:
@@ -38,8 +39,12 @@ def temp_hny_file(tmp_path):
         hny_file = tmp_path / filename
         hny_file.write_text(content)
         
-        # Invalidate import caches so the new module can be found
-        importlib.invalidate_caches()
+        # Forget tmp_path's cached listings so the new module can be found;
+        # cheaper than importlib.invalidate_caches(), which visits every finder
+        loader._finder.invalidate_caches(str(tmp_path))
+        path_finder = sys.path_importer_cache.get(str(tmp_path))
+        if path_finder is not None:
+            path_finder.invalidate_caches()
         
         return hny_file
     
@@ -50,28 +55,50 @@ def temp_hny_file(tmp_path):
         sys.path.remove(str(tmp_path))
 
 
+class _ImportRecorder:
+    """Meta path finder that records the modules imported while it is installed."""
+    
+    def __init__(self):
+        self.names = []
+    
+    def find_spec(self, fullname, path=None, target=None):
+        self.names.append(fullname)
+        return None
+    
+    def invalidate_caches(self):
+        pass
+
+
 @pytest.fixture
 def isolated_sys_path(tmp_path) -> Generator[None, None, None]:
-    """Ensure temp path is in sys.path and clean up sys.modules.
+    """Ensure temp path is in sys.path and clean up sys.path and sys.modules.
     
-    This fixture ensures that dynamically imported modules are cleaned up.
+    This fixture ensures that dynamically imported modules are cleaned up and
+    that directories the test puts on sys.path do not outlive it.
     """
     import importlib
     
+    original_path = sys.path[:]
+    
     # Ensure tmp_path is in sys.path for the test
     if str(tmp_path) not in sys.path:
         sys.path.insert(0, str(tmp_path))
     
-    # Track modules before test
-    original_modules = set(sys.modules.keys())
+    # Record modules as they are imported, instead of snapshotting all of
+    # sys.modules: finders are only asked about names not yet imported
+    recorder = _ImportRecorder()
+    sys.meta_path.insert(0, recorder)
     
     yield
     
+    if recorder in sys.meta_path:
+        sys.meta_path.remove(recorder)
+    
     # Clean up any modules imported during test
-    new_modules = set(sys.modules.keys()) - original_modules
-    for module_name in new_modules:
-        if module_name in sys.modules:
-            del sys.modules[module_name]
+    for module_name in recorder.names:
+        sys.modules.pop(module_name, None)
+    
+    sys.path[:] = original_path
     
     # Invalidate import caches
     importlib.invalidate_caches()
@@ -80,10 +107,9 @@ def isolated_sys_path(tmp_path) -> Generator[None, None, None]:
 @pytest.fixture
 def isolated_meta_path() -> Generator[None, None, None]:
     """Isolate sys.meta_path changes during test."""
-    original_meta_path = sys.meta_path.copy()
+    original_meta_path = sys.meta_path[:]
     yield
-    sys.meta_path.clear()
-    sys.meta_path.extend(original_meta_path)
+    sys.meta_path[:] = original_meta_path
 
 
 @pytest.fixture
@@ -99,14 +125,42 @@ def clean_jar_context():
     from honey.jars import base
     
     # Clear any existing contexts
-    base._sync_jar.set(None)
-    base._async_jar.set(None)
+    sync_token = base._sync_jar.set(None)
+    async_token = base._async_jar.set(None)
     
     yield
     
-    # Clean up after test
-    base._sync_jar.set(None)
-    base._async_jar.set(None)
+    # Restore whatever was active before the test
+    base._sync_jar.reset(sync_token)
+    base._async_jar.reset(async_token)
+
+
+try:
+    import uvloop
+except ImportError:  # optional; not available on Windows
+    uvloop = None
+
+_BaseLoopPolicy = uvloop.EventLoopPolicy if uvloop is not None else asyncio.DefaultEventLoopPolicy
+
+
+class _TestLoopPolicy(_BaseLoopPolicy):
+    """Event loop policy whose loops start tasks eagerly (Python 3.12+)."""
+    
+    def new_event_loop(self):
+        loop = super().new_event_loop()
+        if hasattr(asyncio, "eager_task_factory"):
+            loop.set_task_factory(asyncio.eager_task_factory)
+        return loop
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop when installed, starting tasks eagerly where supported.
+    
+    Mock jars answer without awaiting, so gathered calls finish without a
+    trip through the event loop.
+    """
+    return _TestLoopPolicy()
 
 
 @pytest.fixture
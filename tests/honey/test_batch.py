@@ -0,0 +1,89 @@
+"""Tests for concurrent prompt dispatch helpers."""
+
+import pytest
+import asyncio
+from honey import loader
+from honey.batch import gather_prompts, parallel_map
+from honey.jars import MockJar
+
+
+class TestGatherPrompts:
+    """Tests for gather_prompts."""
+
+    async def test_returns_results_in_order(self, clean_jar_context):
+        """Test results are returned in the order the prompts were passed."""
+        func = loader.create_prompt_function("Task: {{work}}")
+        jar = MockJar()
+
+        async with jar:
+            results = await gather_prompts(
+                func(work="one"),
+                func(work="two"),
+                func(work="three"),
+            )
+
+        assert len(results) == 3
+        assert "Task: one" in results[0]
+        assert "Task: two" in results[1]
+        assert "Task: three" in results[2]
+        assert jar.message_count == 6
+
+    async def test_limits_in_flight_requests(self):
+        """Test no more than max_batch awaitables run at the same time."""
+        in_flight = 0
+        peak = 0
+
+        async def request(i):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return i
+
+        results = await gather_prompts(*(request(i) for i in range(10)), max_batch=3)
+
+        assert results == list(range(10))
+        assert peak == 3
+
+    async def test_no_prompts(self):
+        """Test gathering nothing returns an empty list."""
+        assert await gather_prompts() == []
+
+    async def test_invalid_max_batch(self):
+        """Test max_batch must be positive."""
+        with pytest.raises(ValueError):
+            await gather_prompts(max_batch=0)
+
+
+class TestParallelMap:
+    """Tests for parallel_map."""
+
+    async def test_runs_concurrently(self):
+        """Test awaitables overlap instead of running one after another."""
+        started = []
+
+        async def request(i):
+            started.append(i)
+            await asyncio.sleep(0)
+            # Every request has started before any of them finishes
+            assert len(started) == 3
+            return i * 2
+
+        assert await parallel_map(request(i) for i in range(3)) == [0, 2, 4]
+
+    async def test_raises_after_all_complete(self):
+        """Test the first error is raised only once every awaitable is done."""
+        finished = []
+
+        async def ok():
+            await asyncio.sleep(0)
+            finished.append("ok")
+
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            await parallel_map([fail(), ok()])
+
+        assert finished == ["ok"]
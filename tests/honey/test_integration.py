@@ -1,10 +1,9 @@
 """Integration tests for complete workflows."""
 
-import pytest
 import sys
 import importlib
 from pathlib import Path
-from unittest.mock import Mock, AsyncMock
+from types import SimpleNamespace
 
 
 class TestLoaderJarIntegration:
@@ -85,7 +84,6 @@ class TestLoaderJarIntegration:
 class TestAsyncIntegration:
     """Integration tests for async workflows."""
     
-    @pytest.mark.asyncio
     async def test_async_prompt_execution(self, temp_hny_file, isolated_sys_path, clean_jar_context):
         """Test async prompt execution with jar."""
         from honey.jars import MockJar
@@ -103,7 +101,6 @@ class TestAsyncIntegration:
         assert "Analyze: Sample data" in result
         assert jar.message_count == 2
     
-    @pytest.mark.asyncio
     async def test_async_multi_turn(self, temp_hny_file, isolated_sys_path, clean_jar_context):
         """Test async multi-turn conversation."""
         from honey.jars import MockJar
@@ -122,7 +119,6 @@ class TestAsyncIntegration:
         assert jar.history[0]["content"] == "Python"
         assert jar.history[2]["content"] == "JavaScript"
     
-    @pytest.mark.asyncio
     async def test_concurrent_async_requests(self, temp_hny_file, isolated_sys_path, clean_jar_context):
         """Test concurrent async requests with different jars."""
         import asyncio
@@ -186,8 +182,8 @@ Content: {{content}}"""
         content1 = "summarize\nSummarize: {{text}}"
         content2 = "translate\nTranslate to {{lang}}: {{text}}"
         
-        hny_path1 = temp_hny_file(content1, "tools1.hny")
-        hny_path2 = temp_hny_file(content2, "tools2.hny")
+        hny_path = temp_hny_file(content1, "tools1.hny")
+        hny_path = temp_hny_file(content2, "tools2.hny")
         
         tools1 = importlib.import_module("tools1")
         tools2 = importlib.import_module("tools2")
@@ -221,18 +217,24 @@ Content: {{content}}"""
             api_key="test-key"
         )
         
-        # Mock the client
-        mock_client = Mock()
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content="Generated"))]
-        mock_response.usage = Mock(total_tokens=50)
-        mock_client.chat.completions.create.return_value = mock_response
-        jar._client = mock_client
+        # Stub the client, recording the arguments of each request
+        requests = []
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="Generated"))],
+            usage=SimpleNamespace(total_tokens=50),
+        )
+        
+        def create(**kwargs):
+            requests.append(kwargs)
+            return response
+        
+        jar._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
         
         with jar:
             result = generator.generate(prompt="Test")
         
-        call_kwargs = mock_client.chat.completions.create.call_args.kwargs
+        assert len(requests) == 1
+        call_kwargs = requests[0]
         assert call_kwargs["model"] == "gpt-4"
         assert call_kwargs["temperature"] == 0.7
         assert call_kwargs["max_tokens"] == 100
@@ -1,8 +1,13 @@
 """Synchronous tests for jar classes."""
 
+import json
+import subprocess
+import sys
 import pytest
 from unittest.mock import Mock, MagicMock, patch
-from honey.jars import Jar, MockJar, OpenAIJar, OpenAICompatibleJar, AnthropicJar, GeminiJar, get_active_jar
+from honey.jars import Jar, MockJar, OpenAIJar, OpenAICompatibleJar, OpenAIClientJar, AnthropicJar, GeminiJar, get_active_jar
+from honey.jars import _client_pool
+from honey.jars.base import split_system_prompt
 
 
 class TestJarBase:
@@ -41,6 +46,31 @@ class TestJarBase:
         assert len(jar.history) == 1
         assert len(history) == 2
     
+    def test_history_len(self):
+        """Test history_len tracks the number of messages in history."""
+        jar = MockJar(system_prompt="You are helpful")
+        jar.add_message("user", "Test")
+        
+        assert jar.history_len == 2
+        
+        jar.clear_history()
+        
+        assert jar.history_len == 0
+    
+    def test_extend_history(self):
+        """Test extend_history matches adding the messages one by one."""
+        jar = MockJar()
+        jar.extend_history([("system", "Be brief"), ("user", "Hi"), ("assistant", "Hello")])
+        
+        expected = MockJar()
+        for role, content in [("system", "Be brief"), ("user", "Hi"), ("assistant", "Hello")]:
+            expected.add_message(role, content)
+        
+        assert jar.history == expected.history
+        assert jar.message_count == 3
+        assert jar._system_prompt == "Be brief"
+        assert jar._messages == expected._messages
+    
     def test_clear_history(self):
         """Test clearing history resets all counters."""
         jar = MockJar()
@@ -62,6 +92,117 @@ class TestJarBase:
         assert jar.history[0]["content"] == "You are helpful"
 
 
+    def test_fork_copies_state(self):
+        """Test fork starts with the same config and history."""
+        jar = MockJar(system_prompt="System", temperature=0.5)
+        jar.add_message("user", "Hello")
+        
+        forked = jar.fork()
+        
+        assert type(forked) is MockJar
+        assert forked.config == jar.config
+        assert forked.history == jar.history
+        assert forked.message_count == 2
+        assert forked.total_tokens == 0
+    
+    def test_fork_state_is_independent(self):
+        """Test changes to a fork do not affect the original."""
+        jar = MockJar(system_prompt="System")
+        
+        forked = jar.fork()
+        forked.execute("Only in fork")
+        forked.add_system_prompt("Changed")
+        forked.update_config(temperature=1.0)
+        
+        assert len(jar.history) == 1
+        assert jar.history[0]["content"] == "System"
+        assert jar.message_count == 1
+        assert "temperature" not in jar.config
+    
+    def test_update_config_refreshes_request_kwargs(self):
+        """Test request parameters follow update_config changes."""
+        jar = AnthropicJar(api_key="test-key", temperature=0.2)
+        
+        assert jar._request_kwargs()["temperature"] == 0.2
+        assert "api_key" not in jar._request_kwargs()
+        
+        jar.update_config(temperature=0.9, max_tokens=100)
+        
+        assert jar.config["temperature"] == 0.9
+        assert jar._request_kwargs()["temperature"] == 0.9
+        assert jar._request_kwargs()["max_tokens"] == 100
+    
+    def test_call_kwargs_computed_once(self):
+        """Test OpenAI request parameters are reused until the config cache is invalidated."""
+        jar = OpenAIJar(model="gpt-4", api_key="test-key", temperature=0.2)
+        
+        kwargs = jar._call_kwargs()
+        assert kwargs == {"temperature": 0.2}
+        assert jar._call_kwargs() is kwargs
+        assert jar._call_kwargs(exclude=("temperature",)) == {}
+        
+        jar.config["temperature"] = 0.5
+        jar._invalidate_config_cache()
+        assert jar._call_kwargs() == {"temperature": 0.5}
+    
+    def test_roles_are_interned(self):
+        """Test roles built at runtime are stored as the interned role strings."""
+        jar = MockJar()
+        role = "".join(["us", "er"])
+        jar.add_message(role, "Hi")
+        jar.extend_history([("".join(["assis", "tant"]), "Hello")])
+        
+        assert jar.history[0]["role"] is sys.intern("user")
+        assert jar.history[1]["role"] is sys.intern("assistant")
+    
+    def test_split_system_prompt(self):
+        """Test the system prompt is separated and the last one wins."""
+        user = {"role": "user", "content": "Hi"}
+        
+        assert split_system_prompt([user]) == (None, [user])
+        assert split_system_prompt([{"role": "system", "content": "A"}, user]) == ("A", [user])
+        assert split_system_prompt([
+            {"role": "system", "content": "A"}, user, {"role": "system", "content": "B"},
+        ]) == ("B", [user])
+    
+    def test_fork_shares_clients(self):
+        """Test forks reuse the original jar's API clients."""
+        jar = OpenAIJar(api_key="test-key")
+        jar._client = Mock()
+        jar._async_client = Mock()
+        
+        forked = jar.fork()
+        
+        assert forked._client is jar._client
+        assert forked._async_client is jar._async_client
+
+
+class TestLazyImports:
+    """Tests for the lazily imported jar modules."""
+    
+    def test_importing_one_jar_skips_the_others(self):
+        """Test importing a jar does not load the other jar modules."""
+        code = (
+            "import sys\n"
+            "from honey.jars import MockJar\n"
+            "print(sorted(m for m in ('honey.jars.openai', 'honey.jars.anthropic', "
+            "'honey.jars.gemini') if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        
+        assert result.stdout.strip() == "[]"
+    
+    def test_aliases_resolve_to_jar_classes(self):
+        """Test the package shortcuts name the same classes as honey.jars."""
+        import honey
+        
+        assert honey.openai_jar is OpenAIJar
+        assert honey.anthropic_jar is AnthropicJar
+        assert "gemini_jar" in dir(honey)
+        with pytest.raises(AttributeError):
+            honey.missing_jar
+
+
 class TestMockJar:
     """Tests for MockJar."""
     
@@ -123,6 +264,17 @@ class TestJarContextManagers:
         
         assert get_active_jar() is None
     
+    def test_same_jar_reentrant(self, clean_jar_context):
+        """Test the same jar can be entered again while already active."""
+        jar = MockJar()
+        
+        with jar:
+            with jar:
+                assert get_active_jar() is jar
+            assert get_active_jar() is jar
+        
+        assert get_active_jar() is None
+    
     def test_sync_context_cleanup_on_exception(self, clean_jar_context):
         """Test sync context cleans up even on exception."""
         jar = MockJar()
@@ -135,6 +287,23 @@ class TestJarContextManagers:
             pass
         
         assert get_active_jar() is None
+    
+    def test_exit_out_of_order_raises(self, clean_jar_context):
+        """Test exiting a jar that is not the innermost one leaves the stack alone."""
+        outer = MockJar()
+        inner = MockJar()
+        outer.__enter__()
+        inner.__enter__()
+        
+        with pytest.raises(RuntimeError, match="innermost active jar"):
+            outer.__exit__(None, None, None)
+        
+        assert get_active_jar() is inner
+    
+    def test_exit_without_enter_raises(self, clean_jar_context):
+        """Test exiting a jar that was never entered raises RuntimeError."""
+        with pytest.raises(RuntimeError, match="is no jar"):
+            MockJar().__exit__(None, None, None)
 
 
 class TestOpenAIJar:
@@ -185,6 +354,90 @@ class TestOpenAIJar:
         assert call_kwargs["model"] == "gpt-4"
         assert call_kwargs["temperature"] == 0.7
         assert "api_key" not in call_kwargs  # Should be filtered out
+    
+    def test_update_config_changes_model(self):
+        """Test requests use the model set through update_config."""
+        jar = OpenAIJar(model="gpt-4", api_key="test-key")
+        
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = Mock(
+            choices=[Mock(message=Mock(content="Response"))], usage=None
+        )
+        jar._client = mock_client
+        
+        jar.update_config(model="gpt-4o")
+        jar.execute("Test")
+        
+        assert mock_client.chat.completions.create.call_args.kwargs["model"] == "gpt-4o"
+    
+    def test_responses_support_detected_once_per_client(self):
+        """Test the responses API check is memoized for each client."""
+        class Client:
+            lookups = 0
+            
+            @property
+            def responses(self):
+                Client.lookups += 1
+                return None
+        
+        jar = OpenAIJar(api_key="test-key")
+        client, other = Client(), Client()
+        
+        assert not jar._supports_responses(client)
+        assert not jar._supports_responses(client)
+        assert not jar._supports_responses(other)
+        assert Client.lookups == 2
+    
+    def test_execute_batch(self):
+        """Test execute_batch uploads requests, polls and returns responses in order."""
+        jar = OpenAIJar(model="gpt-4", api_key="test-key", system_prompt="Be brief")
+        
+        def result(custom_id, content):
+            body = {"choices": [{"message": {"content": content}}], "usage": {"total_tokens": 5}}
+            return json.dumps({"custom_id": custom_id, "response": {"status_code": 200, "body": body}})
+        
+        mock_client = Mock()
+        mock_client.files.create.return_value = Mock(id="file-in")
+        mock_client.batches.create.return_value = Mock(id="batch-1", status="validating")
+        mock_client.batches.retrieve.side_effect = [
+            Mock(id="batch-1", status="in_progress"),
+            Mock(id="batch-1", status="completed", output_file_id="file-out"),
+        ]
+        mock_client.files.content.return_value = Mock(text=result("1", "Two") + "\n" + result("0", "One"))
+        jar._client = mock_client
+        
+        with patch("honey.jars.openai.time.sleep") as sleep:
+            results = jar.execute_batch(["first", "second"], poll_interval=1)
+        
+        assert results == ["One", "Two"]
+        assert [c.args[0] for c in sleep.call_args_list] == [1, 2]
+        assert jar.total_tokens == 10
+        assert jar.history == [{"role": "system", "content": "Be brief"}]
+        
+        _, payload = mock_client.files.create.call_args.kwargs["file"]
+        requests = [json.loads(line) for line in payload.decode().splitlines()]
+        assert requests[1]["custom_id"] == "1"
+        assert requests[1]["body"]["model"] == "gpt-4"
+        assert requests[1]["body"]["messages"] == [
+            {"role": "system", "content": "Be brief"},
+            {"role": "user", "content": "second"},
+        ]
+    
+    def test_execute_batch_raises_when_batch_fails(self):
+        """Test execute_batch raises when the batch does not complete."""
+        jar = OpenAIJar(model="gpt-4", api_key="test-key")
+        
+        mock_client = Mock()
+        mock_client.batches.create.return_value = Mock(id="batch-1", status="failed")
+        jar._client = mock_client
+        
+        with pytest.raises(RuntimeError, match="failed"):
+            jar.execute_batch(["prompt"])
+    
+    def test_execute_batch_unsupported(self):
+        """Test jars without a batch API raise NotImplementedError."""
+        with pytest.raises(NotImplementedError):
+            AnthropicJar(api_key="test-key").execute_batch(["prompt"])
 
 
 class TestAnthropicJar:
@@ -197,6 +450,11 @@ class TestAnthropicJar:
         assert jar.config["model"] == "claude-3-5-sonnet-20241022"
         assert jar.config["api_key"] == "test-key"
     
+    def test_max_tokens_defaulted_in_config(self):
+        """Test max_tokens is defaulted once at construction, not per request."""
+        assert AnthropicJar().config["max_tokens"] == 4096
+        assert AnthropicJar(max_tokens=100).config["max_tokens"] == 100
+    
     def test_prepare_messages_separates_system(self):
         """Test that system prompts are separated."""
         jar = AnthropicJar(system_prompt="You are helpful")
@@ -210,6 +468,71 @@ class TestAnthropicJar:
         assert messages[0]["role"] == "user"
         assert messages[1]["role"] == "assistant"
     
+    def test_prepare_messages_tracks_history_changes(self):
+        """Test the split stays in step with system prompt updates and clearing."""
+        jar = AnthropicJar(system_prompt="Old")
+        jar.add_message("user", "Hello")
+        
+        jar.add_system_prompt("New")
+        assert jar._prepare_messages() == ("New", [{"role": "user", "content": "Hello"}])
+        
+        forked = jar.fork()
+        forked.add_message("user", "Only in fork")
+        assert len(jar._prepare_messages()[1]) == 1
+        assert len(forked._prepare_messages()[1]) == 2
+        
+        jar.clear_history()
+        assert jar._prepare_messages() == (None, [])
+    
+    def test_system_block_shared_between_jars(self):
+        """Test jars with the same system prompt send one canonical system block."""
+        first = AnthropicJar(system_prompt="Shared")
+        second = AnthropicJar(system_prompt="Shared")
+        first.add_message("user", "Hi")
+        second.add_message("user", "Hello")
+        
+        system = first._api_kwargs_for(first.history)["system"]
+        assert second._api_kwargs_for(second.history)["system"] is system
+        assert system == [{"type": "text", "text": "Shared", "cache_control": {"type": "ephemeral"}}]
+    
+    def test_api_kwargs_reused_until_history_changes(self):
+        """Test request arguments are rebuilt only when history or config change."""
+        jar = AnthropicJar(system_prompt="Be brief")
+        jar.add_message("user", "Hello")
+        
+        first = jar._api_kwargs_for(jar.history)
+        assert jar._api_kwargs_for(jar.history) is first
+        
+        jar.update_config(temperature=0)
+        second = jar._api_kwargs_for(jar.history)
+        assert second is not first
+        assert second["temperature"] == 0
+        
+        jar.add_message("assistant", "Hi")
+        jar.add_message("user", "Again")
+        assert len(jar._api_kwargs_for(jar.history)["messages"]) == 3
+        
+        jar.add_system_prompt("Be verbose")
+        assert jar._api_kwargs_for(jar.history)["system"][0]["text"] == "Be verbose"
+    
+    def test_api_kwargs_follow_direct_history_changes(self):
+        """Test request arguments are rebuilt after history is edited directly."""
+        jar = AnthropicJar(system_prompt="Be brief", prompt_caching=False)
+        jar.add_message("user", "Hello")
+        jar._api_kwargs_for(jar.history)
+        
+        jar.history.pop()
+        jar.history.append({"role": "user", "content": "Replaced"})
+        assert jar._api_kwargs_for(jar.history)["messages"] == [{"role": "user", "content": "Replaced"}]
+        
+        jar.history.clear()
+        jar.add_message("user", "Fresh")
+        assert jar._api_kwargs_for(jar.history) == {
+            "model": jar.config["model"],
+            "max_tokens": 4096,
+            "messages": [{"role": "user", "content": "Fresh"}],
+        }
+    
     def test_execute_with_mocked_client(self):
         """Test execute with mocked Anthropic client."""
         jar = AnthropicJar(model="claude-3-5-sonnet-20241022", api_key="test-key")
@@ -217,7 +540,7 @@ class TestAnthropicJar:
         mock_client = Mock()
         mock_response = Mock()
         mock_response.content = [Mock(text="Claude response")]
-        mock_response.usage = Mock(input_tokens=10, output_tokens=20)
+        mock_response.usage = Mock(input_tokens=10, output_tokens=20, cache_read_input_tokens=None, cache_creation_input_tokens=None)
         mock_client.messages.create.return_value = mock_response
         
         jar._client = mock_client
@@ -235,7 +558,48 @@ class TestAnthropicJar:
         mock_client = Mock()
         mock_response = Mock()
         mock_response.content = [Mock(text="Response")]
-        mock_response.usage = Mock(input_tokens=5, output_tokens=5)
+        mock_response.usage = Mock(input_tokens=5, output_tokens=5, cache_read_input_tokens=None, cache_creation_input_tokens=None)
+        mock_client.messages.create.return_value = mock_response
+        
+        jar._client = mock_client
+        jar.execute("Test")
+        
+        call_kwargs = mock_client.messages.create.call_args.kwargs
+        assert call_kwargs["system"] == [
+            {"type": "text", "text": "Be helpful", "cache_control": {"type": "ephemeral"}}
+        ]
+    
+    def test_execute_marks_cache_breakpoints(self):
+        """Test the last two user turns carry cache breakpoints without altering history."""
+        jar = AnthropicJar(api_key="test-key")
+        jar.add_message("user", "First")
+        jar.add_message("assistant", "One")
+        jar.add_message("user", "Second")
+        jar.add_message("assistant", "Two")
+        
+        mock_client = Mock()
+        mock_response = Mock()
+        mock_response.content = [Mock(text="Three")]
+        mock_response.usage = Mock(input_tokens=5, output_tokens=5, cache_read_input_tokens=None, cache_creation_input_tokens=None)
+        mock_client.messages.create.return_value = mock_response
+        
+        jar._client = mock_client
+        jar.execute("Third")
+        
+        messages = mock_client.messages.create.call_args.kwargs["messages"]
+        cached = [i for i, msg in enumerate(messages) if not isinstance(msg["content"], str)]
+        assert cached == [2, 4]
+        assert messages[4]["content"][0]["text"] == "Third"
+        assert all(isinstance(msg["content"], str) for msg in jar.history)
+    
+    def test_execute_without_prompt_caching(self):
+        """Test prompt_caching=False sends plain strings."""
+        jar = AnthropicJar(api_key="test-key", system_prompt="Be helpful", prompt_caching=False)
+        
+        mock_client = Mock()
+        mock_response = Mock()
+        mock_response.content = [Mock(text="Response")]
+        mock_response.usage = Mock(input_tokens=5, output_tokens=5, cache_read_input_tokens=None, cache_creation_input_tokens=None)
         mock_client.messages.create.return_value = mock_response
         
         jar._client = mock_client
@@ -243,6 +607,32 @@ class TestAnthropicJar:
         
         call_kwargs = mock_client.messages.create.call_args.kwargs
         assert call_kwargs["system"] == "Be helpful"
+        assert call_kwargs["messages"] == [{"role": "user", "content": "Test"}]
+        # History messages are sent as they are, not rebuilt per request
+        assert call_kwargs["messages"][0] is jar.history[1]
+        assert "prompt_caching" not in call_kwargs
+    
+    def test_execute_tracks_cache_tokens(self):
+        """Test cache read and creation tokens are counted."""
+        jar = AnthropicJar(api_key="test-key")
+        
+        mock_client = Mock()
+        mock_response = Mock()
+        mock_response.content = [Mock(text="Response")]
+        mock_response.usage = Mock(input_tokens=5, output_tokens=10, cache_read_input_tokens=1000, cache_creation_input_tokens=200)
+        mock_client.messages.create.return_value = mock_response
+        
+        jar._client = mock_client
+        jar.execute("Test")
+        
+        assert jar.cache_read_tokens == 1000
+        assert jar.cache_creation_tokens == 200
+        assert jar.total_tokens == 1215
+        
+        jar.clear_history()
+        
+        assert jar.cache_read_tokens == 0
+        assert jar.cache_creation_tokens == 0
 
 
 class TestGeminiJar:
@@ -268,6 +658,49 @@ class TestGeminiJar:
         assert chat_history[1]["role"] == "model"
         assert chat_history[1]["parts"] == ["Hi"]
     
+    def test_prepare_gemini_history_tracks_history_changes(self):
+        """Test the converted history follows system prompt updates, forks and clearing."""
+        jar = GeminiJar(system_prompt="Old")
+        jar.add_message("user", "Hello")
+        jar.add_system_prompt("New")
+        
+        forked = jar.fork()
+        forked.add_message("assistant", "Hi")
+        forked.extend_history([("user", "Again"), ("assistant", "Sure")])
+        
+        assert jar._prepare_gemini_history() == ("New", [{"role": "user", "parts": ["Hello"]}])
+        assert forked._prepare_gemini_history()[1][1:] == [
+            {"role": "model", "parts": ["Hi"]},
+            {"role": "user", "parts": ["Again"]},
+            {"role": "model", "parts": ["Sure"]},
+        ]
+        
+        jar.clear_history()
+        assert jar._prepare_gemini_history() == (None, [])
+    
+    def test_extend_history_after_direct_history_changes(self):
+        """Test extend_history converts only the new messages after a direct edit."""
+        jar = GeminiJar(api_key="test-key")
+        jar.extend_history([("user", "a"), ("assistant", "b")])
+        jar.history.append({"role": "user", "content": "direct"})
+        
+        jar.extend_history([("assistant", "c"), ("user", "d")])
+        
+        assert [msg["parts"] for msg in jar._prepare_gemini_history()[1]] == [["a"], ["b"], ["direct"], ["c"], ["d"]]
+    
+    def test_prepare_gemini_history_converts_each_message_once(self):
+        """Test preparing the jar's own history does not re-convert earlier messages."""
+        jar = GeminiJar(system_prompt="System")
+        
+        with patch.object(GeminiJar, "_to_gemini", wraps=GeminiJar._to_gemini) as to_gemini:
+            for turn in range(5):
+                jar.add_message("user", f"Question {turn}")
+                jar._prepare_gemini_history()
+                jar.add_message("assistant", f"Answer {turn}")
+                jar._prepare_gemini_history()
+        
+        assert to_gemini.call_count == 10
+    
     def test_execute_with_mocked_client(self):
         """Test execute with mocked Gemini client."""
         jar = GeminiJar(model="gemini-2.0-flash-exp", api_key="test-key")
@@ -287,6 +720,153 @@ class TestGeminiJar:
         assert result == "Gemini response"
         assert jar.total_tokens == 25
         assert jar.message_count == 2
+    
+    def test_execute_without_usage_metadata(self):
+        """Test responses without usage metadata leave total_tokens unchanged."""
+        jar = GeminiJar(api_key="test-key")
+        
+        mock_client = Mock()
+        mock_client.start_chat.return_value.send_message.return_value = Mock(text="Reply", usage_metadata=None)
+        jar._client = mock_client
+        
+        assert jar.execute("Test") == "Reply"
+        assert jar.total_tokens == 0
+    
+    def test_execute_continues_chat_session(self):
+        """Test later turns reuse the chat session instead of replaying history."""
+        jar = GeminiJar(api_key="test-key", system_prompt="Be brief")
+        
+        mock_client = Mock()
+        mock_chat = Mock()
+        mock_chat.send_message.return_value = Mock(text="Reply", usage_metadata=Mock(total_token_count=1))
+        mock_client.start_chat.return_value = mock_chat
+        jar._client = mock_client
+        
+        jar.execute("First")
+        jar.execute("Second")
+        
+        mock_client.start_chat.assert_called_once_with(history=[], system_instruction="Be brief")
+        assert mock_chat.send_message.call_args.args == ("Second",)
+    
+    def test_execute_restarts_chat_after_history_changes(self):
+        """Test a new session seeded with history is started after edits."""
+        jar = GeminiJar(api_key="test-key")
+        
+        mock_client = Mock()
+        mock_client.start_chat.return_value.send_message.return_value = Mock(
+            text="Reply", usage_metadata=Mock(total_token_count=1)
+        )
+        jar._client = mock_client
+        
+        jar.execute("First")
+        jar.add_system_prompt("Now be brief")
+        jar.execute("Second")
+        
+        assert mock_client.start_chat.call_count == 2
+        assert mock_client.start_chat.call_args.kwargs == {
+            "history": [{"role": "user", "parts": ["First"]}, {"role": "model", "parts": ["Reply"]}],
+            "system_instruction": "Now be brief",
+        }
+    
+    def test_execute_restarts_chat_after_direct_history_changes(self):
+        """Test editing history directly drops the converted history and session."""
+        jar = GeminiJar(api_key="test-key")
+        
+        mock_client = Mock()
+        mock_client.start_chat.return_value.send_message.return_value = Mock(
+            text="Reply", usage_metadata=Mock(total_token_count=1)
+        )
+        jar._client = mock_client
+        
+        jar.execute("First")
+        jar.history.clear()
+        jar.execute("Second")
+        
+        assert mock_client.start_chat.call_count == 2
+        assert mock_client.start_chat.call_args.kwargs == {"history": []}
+        assert jar._prepare_gemini_history() == (
+            None,
+            [{"role": "user", "parts": ["Second"]}, {"role": "model", "parts": ["Reply"]}],
+        )
+
+
+class _FakeAnthropicStream:
+    """Minimal stand-in for the Anthropic SDK's synchronous message stream."""
+    
+    def __init__(self, chunks, final_message):
+        self.text_stream = iter(chunks)
+        self._final_message = final_message
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+    
+    def get_final_message(self):
+        return self._final_message
+
+
+class TestStreaming:
+    """Tests for synchronous streaming."""
+    
+    def test_default_stream_yields_full_response(self):
+        """Test jars without streaming support yield one chunk."""
+        jar = MockJar()
+        
+        chunks = list(jar.stream("Stream me"))
+        
+        assert len(chunks) == 1
+        assert "[MOCK RESPONSE]" in chunks[0]
+        assert jar.message_count == 2
+    
+    def test_openai_jar_stream(self):
+        """Test OpenAI jar streams chat completion deltas and records usage."""
+        jar = OpenAIJar(model="gpt-4", api_key="test-key")
+        
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = iter([
+            Mock(choices=[Mock(delta=Mock(content="Hel"))], usage=None),
+            Mock(choices=[Mock(delta=Mock(content="lo"))], usage=None),
+            Mock(choices=[], usage=Mock(total_tokens=12)),
+        ])
+        jar._client = mock_client
+        
+        assert list(jar.stream("Hi")) == ["Hel", "lo"]
+        assert jar.history[-1] == {"role": "assistant", "content": "Hello"}
+        assert jar.total_tokens == 12
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+    
+    def test_anthropic_jar_stream(self):
+        """Test Anthropic jar streams text and records the full response."""
+        jar = AnthropicJar(api_key="test-key")
+        
+        usage = Mock(input_tokens=7, output_tokens=3, cache_read_input_tokens=None, cache_creation_input_tokens=None)
+        mock_client = Mock()
+        mock_client.messages.stream.return_value = _FakeAnthropicStream(["Hel", "lo"], Mock(usage=usage))
+        jar._client = mock_client
+        
+        assert list(jar.stream("Hi")) == ["Hel", "lo"]
+        assert jar.history[-1] == {"role": "assistant", "content": "Hello"}
+        assert jar.total_tokens == 10
+    
+    def test_gemini_jar_stream(self):
+        """Test Gemini jar streams chunks from its chat session."""
+        jar = GeminiJar(api_key="test-key")
+        
+        mock_chat = Mock()
+        mock_chat.send_message.return_value = iter([
+            Mock(text="Hel", usage_metadata=None),
+            Mock(text="lo", usage_metadata=Mock(total_token_count=8)),
+        ])
+        mock_client = Mock()
+        mock_client.start_chat.return_value = mock_chat
+        jar._client = mock_client
+        
+        assert list(jar.stream("Hi")) == ["Hel", "lo"]
+        assert jar.history[-1] == {"role": "assistant", "content": "Hello"}
+        assert jar.total_tokens == 8
+        mock_chat.send_message.assert_called_once_with("Hi", stream=True)
 
 
 class TestJarReusability:
@@ -445,3 +1025,216 @@ class TestOpenAICompatibleJar:
         
         assert result == "Response"
         assert jar.total_tokens == 0  # Should not error
+
+
+class TestClientPool:
+    """Tests for the shared HTTP connection pools."""
+    
+    def test_sync_clients_share_http_pool(self):
+        """Test SDK clients of different jars reuse one httpx client."""
+        anthropic_client = AnthropicJar(api_key="test-key")._get_client()
+        openai_client = OpenAIJar(api_key="test-key")._get_client()
+        
+        assert anthropic_client._client is _client_pool.get_httpx_sync()
+        assert openai_client._client is _client_pool.get_httpx_sync()
+    
+    def test_closing_sdk_client_keeps_shared_pool_open(self):
+        """Test one SDK client's close() does not close the pool other jars use."""
+        AnthropicJar(api_key="closing-key")._get_client().close()
+        
+        assert not _client_pool.get_httpx_sync().is_closed
+    
+    def test_no_async_pool_outside_event_loop(self):
+        """Test no shared async client is handed out without a running loop."""
+        assert _client_pool.get_httpx_async() is None
+
+
+class TestClientCache:
+    """Tests for SDK clients shared between jars."""
+    
+    def test_jars_with_same_key_share_client(self):
+        """Test jars configured alike reuse one SDK client."""
+        Jar.reset_client_cache()
+        
+        first = AnthropicJar(api_key="shared-key")._get_client()
+        second = AnthropicJar(api_key="shared-key")._get_client()
+        
+        assert first is second
+    
+    def test_jars_with_different_config_get_own_clients(self):
+        """Test differing API keys or base URLs produce separate clients."""
+        Jar.reset_client_cache()
+        
+        assert AnthropicJar(api_key="a")._get_client() is not AnthropicJar(api_key="b")._get_client()
+        
+        local = OpenAICompatibleJar(model="llama3", base_url="http://localhost:11434/v1")
+        other = OpenAICompatibleJar(model="llama3", base_url="http://localhost:8000/v1")
+        assert local._get_client() is not other._get_client()
+    
+    def test_gemini_jars_share_client(self):
+        """Test Gemini jars with the same API key reuse one client."""
+        Jar.reset_client_cache()
+        
+        assert GeminiJar(api_key="shared-key")._get_client() is GeminiJar(api_key="shared-key")._get_client()
+    
+    def test_injected_clients_bypass_cache(self):
+        """Test OpenAIClientJar uses its own clients and leaves the shared cache alone."""
+        Jar.reset_client_cache()
+        sync_client, async_client = Mock(), Mock()
+        
+        jar = OpenAIClientJar(model="gpt-4", sync_client=sync_client, async_client=async_client)
+        
+        assert jar._get_client() is sync_client
+        assert jar._get_async_client() is async_client
+        assert Jar._client_cache == {}
+    
+    def test_reset_client_cache(self):
+        """Test resetting the cache makes new jars build a fresh client."""
+        first = OpenAIJar(api_key="test-key")._get_client()
+        
+        Jar.reset_client_cache()
+        
+        assert OpenAIJar(api_key="test-key")._get_client() is not first
+
+
+class TestResponseCache:
+    """Tests for the opt-in response cache."""
+    
+    def test_identical_conversation_is_answered_from_cache(self):
+        """Test a repeated conversation does not call the API again."""
+        Jar.clear_response_cache()
+        
+        with patch.object(MockJar, "_call", return_value="Cached answer") as call:
+            first = MockJar(cache_responses=True, model="mock").execute("Same question")
+            second = MockJar(cache_responses=True, model="mock").execute("Same question")
+        
+        assert first == second == "Cached answer"
+        assert call.call_count == 1
+        assert Jar.cache_stats() == {"hits": 1, "misses": 1, "size": 1, "semantic_hits": 0}
+    
+    def test_disabled_by_default(self):
+        """Test jars without cache_responses always call the API."""
+        Jar.clear_response_cache()
+        
+        with patch.object(MockJar, "_call", return_value="Answer") as call:
+            MockJar().execute("Same question")
+            MockJar().execute("Same question")
+        
+        assert call.call_count == 2
+        assert "cache_responses" not in MockJar(cache_responses=True).config
+    
+    def test_nonzero_temperature_is_not_cached(self):
+        """Test sampled responses are never reused."""
+        Jar.clear_response_cache()
+        
+        with patch.object(MockJar, "_call", return_value="Answer") as call:
+            MockJar(cache_responses=True, temperature=0.7).execute("Same question")
+            MockJar(cache_responses=True, temperature=0.7).execute("Same question")
+        
+        assert call.call_count == 2
+        assert Jar.cache_stats()["size"] == 0
+    
+    def test_different_endpoints_are_cached_separately(self):
+        """Test jars pointing at different base URLs do not share responses."""
+        Jar.clear_response_cache()
+        
+        with patch.object(OpenAICompatibleJar, "_call", side_effect=["From Ollama", "From vLLM"]) as call:
+            first = OpenAICompatibleJar(
+                base_url="http://localhost:11434/v1", model="llama3", api_key="x", cache_responses=True
+            ).execute("Same question")
+            second = OpenAICompatibleJar(
+                base_url="http://localhost:8000/v1", model="llama3", api_key="x", cache_responses=True
+            ).execute("Same question")
+        
+        assert (first, second) == ("From Ollama", "From vLLM")
+        assert call.call_count == 2
+    
+    def test_history_digest_follows_history_changes(self):
+        """Test the incremental history digest matches a digest of the same messages."""
+        jar = MockJar(system_prompt="System")
+        jar.add_message("user", "Hello")
+        first = jar._messages_digest(jar.history)
+        
+        jar.add_message("assistant", "Hi")
+        assert jar._messages_digest(jar.history) == jar._messages_digest(list(jar.history))
+        
+        jar.add_system_prompt("Changed")
+        assert jar._messages_digest(jar.history) == jar._messages_digest(list(jar.history))
+        
+        jar.clear_history()
+        jar.add_message("system", "System")
+        jar.add_message("user", "Hello")
+        assert jar._messages_digest(jar.history) == first
+        assert jar._messages_digest(jar.history, prefix=True) == jar._messages_digest(jar.history[:1])
+    
+    def test_direct_history_changes_are_not_answered_from_cache(self):
+        """Test editing history directly does not leave a stale cache key."""
+        Jar.clear_response_cache()
+        jar = MockJar(cache_responses=True)
+        
+        with patch.object(MockJar, "_call", side_effect=lambda messages: messages[-1]["content"]) as call:
+            assert jar.execute("a") == "a"
+            jar.history.clear()
+            assert jar.execute("b") == "b"
+            jar.history[:] = [{"role": "user", "content": "a"}]
+            jar.history.append({"role": "assistant", "content": "a"})
+            assert jar.execute("c") == "c"
+        
+        assert call.call_count == 3
+        assert jar._messages_digest(jar.history) == jar._messages_digest(list(jar.history))
+    
+    def test_least_recently_used_entries_are_evicted(self, monkeypatch):
+        """Test the cache keeps at most _response_cache_max entries."""
+        Jar.clear_response_cache()
+        monkeypatch.setattr(Jar, "_response_cache_max", 2)
+        jar = MockJar(cache_responses=True)
+        
+        for prompt in ["one", "two", "three"]:
+            jar.clear_history()
+            jar.execute(prompt)
+        
+        assert Jar.cache_stats()["size"] == 2
+
+
+def _word_embedder(texts):
+    """Bag-of-words embeddings over a tiny vocabulary, standing in for MiniLM."""
+    vocabulary = ["summarize", "article", "translate", "please", "this"]
+    return [[text.lower().count(word) for word in vocabulary] for text in texts]
+
+
+class TestSemanticCache:
+    """Tests for the similarity lookup behind the response cache."""
+    
+    @pytest.fixture(autouse=True)
+    def semantic_cache(self, monkeypatch):
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(Jar, "_semantic_cache", Jar._semantic_cache)
+        Jar.configure_semantic_cache(embedder=_word_embedder)
+        Jar.clear_response_cache()
+    
+    def test_similar_prompt_is_answered_from_cache(self):
+        """Test a paraphrased prompt after the same conversation reuses the response."""
+        with patch.object(MockJar, "_call", return_value="Summary") as call:
+            first = MockJar(cache_responses=True, semantic_threshold=0.8).execute("Summarize this article")
+            second = MockJar(cache_responses=True, semantic_threshold=0.8).execute("Please summarize this article")
+            third = MockJar(cache_responses=True, semantic_threshold=0.8).execute("Translate this")
+        
+        assert first == second == third == "Summary"
+        assert call.call_count == 2
+        assert Jar.cache_stats()["semantic_hits"] == 1
+    
+    def test_different_context_is_not_reused(self):
+        """Test similar prompts after different conversations are answered separately."""
+        with patch.object(MockJar, "_call", return_value="Summary") as call:
+            MockJar(cache_responses=True, semantic_threshold=0.8, system_prompt="A").execute("Summarize this article")
+            MockJar(cache_responses=True, semantic_threshold=0.8, system_prompt="B").execute("Summarize this article")
+        
+        assert call.call_count == 2
+    
+    async def test_async_lookup(self):
+        """Test aexecute uses the semantic cache too."""
+        with patch.object(MockJar, "_acall", return_value="Summary") as acall:
+            await MockJar(cache_responses=True, semantic_threshold=0.8).aexecute("Summarize this article")
+            await MockJar(cache_responses=True, semantic_threshold=0.8).aexecute("Please summarize this article")
+        
+        assert acall.call_count == 1
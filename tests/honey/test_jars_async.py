@@ -2,14 +2,15 @@
 
 import pytest
 import asyncio
-from unittest.mock import Mock, AsyncMock, MagicMock
-from honey.jars import MockJar, OpenAIJar, OpenAICompatibleJar, AnthropicJar, GeminiJar, get_active_async_jar
+from types import SimpleNamespace
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
+from honey.jars import Jar, MockJar, OpenAIJar, OpenAICompatibleJar, AnthropicJar, GeminiJar, get_active_async_jar
+from honey.jars import _client_pool
 
 
 class TestAsyncJarContextManagers:
     """Tests for async jar context manager behavior."""
     
-    @pytest.mark.asyncio
     async def test_async_context_manager_sets_active_jar(self, clean_jar_context):
         """Test async context manager sets jar as active."""
         jar = MockJar()
@@ -21,7 +22,6 @@ class TestAsyncJarContextManagers:
         
         assert get_active_async_jar() is None
     
-    @pytest.mark.asyncio
     async def test_async_context_manager_returns_jar(self):
         """Test async context manager returns jar instance."""
         jar = MockJar()
@@ -29,7 +29,6 @@ class TestAsyncJarContextManagers:
         async with jar as j:
             assert j is jar
     
-    @pytest.mark.asyncio
     async def test_nested_async_context_managers(self, clean_jar_context):
         """Test nested async context managers - inner overrides outer."""
         outer = MockJar()
@@ -45,7 +44,17 @@ class TestAsyncJarContextManagers:
         
         assert get_active_async_jar() is None
     
-    @pytest.mark.asyncio
+    async def test_same_jar_reentrant(self, clean_jar_context):
+        """Test the same jar can be entered again while already active."""
+        jar = MockJar()
+        
+        async with jar:
+            async with jar:
+                assert get_active_async_jar() is jar
+            assert get_active_async_jar() is jar
+        
+        assert get_active_async_jar() is None
+    
     async def test_async_context_cleanup_on_exception(self, clean_jar_context):
         """Test async context cleans up even on exception."""
         jar = MockJar()
@@ -58,104 +67,347 @@ class TestAsyncJarContextManagers:
             pass
         
         assert get_active_async_jar() is None
+    
+    async def test_exit_out_of_order_raises(self, clean_jar_context):
+        """Test exiting a jar that is not the innermost one leaves the stack alone."""
+        outer = MockJar()
+        inner = MockJar()
+        await outer.__aenter__()
+        await inner.__aenter__()
+        
+        with pytest.raises(RuntimeError, match="innermost active jar"):
+            await outer.__aexit__(None, None, None)
+        
+        assert get_active_async_jar() is inner
+    
+    async def test_exit_without_enter_raises(self, clean_jar_context):
+        """Test exiting a jar that was never entered raises RuntimeError."""
+        with pytest.raises(RuntimeError, match="is no jar"):
+            await MockJar().__aexit__(None, None, None)
+
+
+def _async_returning(value):
+    """Async callable that accepts any arguments and returns ``value``."""
+    async def call(*args, **kwargs):
+        return value
+    return call
+
+
+def _openai_response(content, total_tokens=None):
+    """Chat completion response with ``content``; usage is omitted without ``total_tokens``."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(total_tokens=total_tokens) if total_tokens is not None else None,
+    )
+
+
+def _openai_async_client(create):
+    """Async OpenAI-style client whose chat.completions.create is ``create``."""
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def _openai_async_jar():
+    """OpenAI jar whose async client answers "Async AI response" using 60 tokens."""
+    jar = OpenAIJar(model="gpt-4", api_key="test-key")
+    jar._async_client = _openai_async_client(_async_returning(_openai_response("Async AI response", 60)))
+    return jar
+
+
+def _anthropic_async_jar():
+    """Anthropic jar whose async client answers "Async Claude response" using 40 tokens."""
+    jar = AnthropicJar(model="claude-3-5-sonnet-20241022", api_key="test-key")
+    response = SimpleNamespace(
+        content=[SimpleNamespace(text="Async Claude response")],
+        usage=SimpleNamespace(input_tokens=15, output_tokens=25, cache_read_input_tokens=None, cache_creation_input_tokens=None),
+    )
+    jar._async_client = SimpleNamespace(messages=SimpleNamespace(create=_async_returning(response)))
+    return jar
+
+
+def _gemini_async_jar():
+    """Gemini jar whose chat sessions answer "Async Gemini response" using 30 tokens."""
+    jar = GeminiJar(model="gemini-2.0-flash-exp", api_key="test-key")
+    response = SimpleNamespace(text="Async Gemini response", usage_metadata=SimpleNamespace(total_token_count=30))
+    chat = SimpleNamespace(send_message_async=_async_returning(response))
+    client = SimpleNamespace(start_chat=lambda **kwargs: chat)
+    # Set both sync and async clients to avoid lazy loading
+    jar._client = client
+    jar._async_client = client
+    return jar
 
 
 class TestAsyncExecution:
     """Tests for async execution methods."""
     
-    @pytest.mark.asyncio
-    async def test_mock_jar_aexecute(self):
-        """Test MockJar async execution."""
-        jar = MockJar()
+    @pytest.mark.parametrize("jar_factory, expected, tokens", [
+        (MockJar, "[ASYNC MOCK RESPONSE]\nPrompt: Test prompt...", 0),
+        (_openai_async_jar, "Async AI response", 60),
+        (_anthropic_async_jar, "Async Claude response", 40),
+        (_gemini_async_jar, "Async Gemini response", 30),
+    ], ids=["mock", "openai", "anthropic", "gemini"])
+    async def test_provider_aexecute(self, jar_factory, expected, tokens):
+        """Test each jar answers asynchronously and records the turn and its usage."""
+        jar = jar_factory()
         
         result = await jar.aexecute("Test prompt")
         
-        assert "[ASYNC MOCK RESPONSE]" in result
-        assert "Test prompt" in result
+        assert result == expected
+        assert jar.total_tokens == tokens
         assert jar.message_count == 2
     
-    @pytest.mark.asyncio
-    async def test_openai_jar_aexecute(self):
-        """Test OpenAI jar async execution with mocked client."""
+    async def test_gemini_jar_aexecute_runs_sync_session_in_thread(self):
+        """Test sessions without send_message_async do not block the event loop."""
+        jar = GeminiJar(api_key="test-key")
+        
+        mock_client = Mock()
+        mock_chat = Mock(spec=["send_message"])
+        mock_chat.send_message.return_value = Mock(text="Threaded response", usage_metadata=Mock(total_token_count=5))
+        mock_client.start_chat.return_value = mock_chat
+        jar._async_client = mock_client
+        
+        with patch("honey.jars.gemini.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            result = await jar.aexecute("Test")
+        
+        assert result == "Threaded response"
+        to_thread.assert_called_once_with(mock_chat.send_message, "Test")
+
+
+async def _aiter(items):
+    """Async iterator over ``items``, standing in for an SDK response stream."""
+    for item in items:
+        yield item
+
+
+class _FakeAnthropicStream:
+    """Minimal stand-in for the Anthropic SDK message stream."""
+    
+    def __init__(self, chunks, final_message):
+        self._chunks = chunks
+        self._final_message = final_message
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+    
+    @property
+    async def text_stream(self):
+        for chunk in self._chunks:
+            yield chunk
+    
+    async def get_final_message(self):
+        return self._final_message
+
+
+class TestAsyncStreaming:
+    """Tests for streaming async execution."""
+    
+    async def test_default_astream_yields_full_response(self):
+        """Test jars without streaming support yield one chunk."""
+        jar = MockJar()
+        
+        chunks = [chunk async for chunk in jar.astream("Stream me")]
+        
+        assert len(chunks) == 1
+        assert "[ASYNC MOCK RESPONSE]" in chunks[0]
+        assert jar.message_count == 2
+    
+    async def test_anthropic_jar_astream(self):
+        """Test Anthropic jar streams text and records the full response."""
+        jar = AnthropicJar(api_key="test-key", system_prompt="Be brief")
+        
+        final_message = Mock(usage=Mock(input_tokens=7, output_tokens=3, cache_read_input_tokens=None, cache_creation_input_tokens=None))
+        mock_client = Mock()
+        mock_client.messages.stream.return_value = _FakeAnthropicStream(
+            ["Hel", "lo", "!"], final_message
+        )
+        jar._async_client = mock_client
+        
+        chunks = [chunk async for chunk in jar.astream("Hi")]
+        
+        assert chunks == ["Hel", "lo", "!"]
+        assert jar.history[-1] == {"role": "assistant", "content": "Hello!"}
+        assert jar.total_tokens == 10
+        call_kwargs = mock_client.messages.stream.call_args.kwargs
+        assert call_kwargs["system"][0]["text"] == "Be brief"
+        assert call_kwargs["max_tokens"] == 4096
+    
+    async def test_openai_jar_astream(self):
+        """Test OpenAI jar streams chat completion deltas and records usage."""
         jar = OpenAIJar(model="gpt-4", api_key="test-key")
         
-        # Mock async client
+        chunks = [
+            Mock(choices=[Mock(delta=Mock(content="Hel"))], usage=None),
+            Mock(choices=[Mock(delta=Mock(content="lo"))], usage=None),
+            Mock(choices=[], usage=Mock(total_tokens=12)),
+        ]
         mock_client = AsyncMock()
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content="Async AI response"))]
-        mock_response.usage = Mock(total_tokens=60)
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = _aiter(chunks)
+        jar._async_client = mock_client
+        
+        streamed = [chunk async for chunk in jar.astream("Hi")]
         
+        assert streamed == ["Hel", "lo"]
+        assert jar.history[-1] == {"role": "assistant", "content": "Hello"}
+        assert jar.total_tokens == 12
+        call_kwargs = mock_client.chat.completions.create.call_args.kwargs
+        assert call_kwargs["stream"] is True
+        assert call_kwargs["messages"] == [{"role": "user", "content": "Hi"}]
+    
+    async def test_openai_jar_astream_responses_api(self):
+        """Test OpenAI jar streams output text deltas from the responses API."""
+        jar = OpenAIJar(model="gpt-4", api_key="test-key")
+        
+        events = [
+            Mock(type="response.output_text.delta", delta="Hi "),
+            Mock(type="response.output_text.delta", delta="there"),
+            Mock(type="response.completed", response=Mock(usage=Mock(total_tokens=9))),
+        ]
+        # Mock clients are treated as chat-only, so use a plain object
+        create = AsyncMock(return_value=_aiter(events))
+        jar._async_client = SimpleNamespace(responses=SimpleNamespace(create=create))
+        
+        streamed = [chunk async for chunk in jar.astream("Hello")]
+        
+        assert streamed == ["Hi ", "there"]
+        assert jar.history[-1] == {"role": "assistant", "content": "Hi there"}
+        assert jar.total_tokens == 9
+        assert create.call_args.kwargs["stream"] is True
+    
+    async def test_gemini_jar_astream(self):
+        """Test Gemini jar streams chunks and continues the session afterwards."""
+        jar = GeminiJar(api_key="test-key")
+        
+        mock_chat = Mock()
+        mock_chat.send_message_async = AsyncMock(side_effect=[
+            _aiter([Mock(text="Hel"), Mock(text="lo", usage_metadata=Mock(total_token_count=8))]),
+            Mock(text="Again", usage_metadata=Mock(total_token_count=4)),
+        ])
+        mock_client = Mock()
+        mock_client.start_chat.return_value = mock_chat
         jar._async_client = mock_client
         
-        result = await jar.aexecute("Async test prompt")
+        streamed = [chunk async for chunk in jar.astream("Hi")]
         
-        assert result == "Async AI response"
-        assert jar.total_tokens == 60
-        assert jar.message_count == 2
-        mock_client.chat.completions.create.assert_called_once()
+        assert streamed == ["Hel", "lo"]
+        assert jar.history[-1] == {"role": "assistant", "content": "Hello"}
+        assert jar.total_tokens == 8
+        mock_chat.send_message_async.assert_called_with("Hi", stream=True)
+        
+        await jar.aexecute("More")
+        mock_client.start_chat.assert_called_once()
+
+
+class TestAexecuteMany:
+    """Tests for batched async execution."""
     
-    @pytest.mark.asyncio
-    async def test_anthropic_jar_aexecute(self):
-        """Test Anthropic jar async execution with mocked client."""
-        jar = AnthropicJar(model="claude-3-5-sonnet-20241022", api_key="test-key")
+    async def test_returns_responses_in_order(self):
+        """Test responses come back in prompt order without touching history."""
+        jar = MockJar(system_prompt="Be brief")
+        
+        results = await jar.aexecute_many(["one", "two", "three"])
+        
+        assert [r.split("Prompt: ")[1] for r in results] == ["one...", "two...", "three..."]
+        assert jar.history == [{"role": "system", "content": "Be brief"}]
+        assert jar.message_count == 1
+    
+    async def test_each_prompt_follows_history_snapshot(self):
+        """Test every request sends the existing history plus its own prompt."""
+        jar = AnthropicJar(api_key="test-key", prompt_caching=False)
+        jar.add_message("user", "Earlier")
+        jar.add_message("assistant", "Reply")
         
         mock_client = AsyncMock()
         mock_response = Mock()
-        mock_response.content = [Mock(text="Async Claude response")]
-        mock_response.usage = Mock(input_tokens=15, output_tokens=25)
+        mock_response.content = [Mock(text="Answer")]
+        mock_response.usage = Mock(input_tokens=2, output_tokens=3, cache_read_input_tokens=None, cache_creation_input_tokens=None)
         mock_client.messages.create.return_value = mock_response
-        
         jar._async_client = mock_client
         
-        result = await jar.aexecute("Async test")
+        results = await jar.aexecute_many(["A", "B"], max_concurrency=1)
         
-        assert result == "Async Claude response"
-        assert jar.total_tokens == 40
+        assert results == ["Answer", "Answer"]
+        sent = [call.kwargs["messages"] for call in mock_client.messages.create.call_args_list]
+        assert [messages[-1]["content"] for messages in sent] == ["A", "B"]
+        assert all(messages[:2] == jar.history for messages in sent)
         assert jar.message_count == 2
+        assert jar.total_tokens == 10
     
-    @pytest.mark.asyncio
-    async def test_gemini_jar_aexecute(self):
-        """Test Gemini jar async execution with mocked client."""
-        jar = GeminiJar(model="gemini-2.0-flash-exp", api_key="test-key")
+    async def test_unsupported_jar_raises(self):
+        """Test jars without _acall report that batching is unsupported."""
+        class EchoJar(Jar):
+            def execute(self, prompt, **metadata):
+                return prompt
+            
+            async def aexecute(self, prompt, **metadata):
+                return prompt
         
+        with pytest.raises(NotImplementedError):
+            await EchoJar().aexecute_many(["x"])
+    
+    async def test_gemini_sessions_start_from_history_without_prompt(self):
+        """Test each Gemini session is seeded with the history before its prompt."""
+        jar = GeminiJar(api_key="test-key", system_prompt="Be brief")
+        jar.add_message("user", "Hi")
+        jar.add_message("assistant", "Hello")
+        
+        mock_chat = Mock()
+        mock_chat.send_message_async = AsyncMock(return_value=Mock(text="Reply", usage_metadata=None))
         mock_client = Mock()
-        mock_chat = AsyncMock()
-        mock_response = Mock()
-        mock_response.text = "Async Gemini response"
-        mock_response.usage_metadata = Mock(total_token_count=30)
-        mock_chat.send_message_async.return_value = mock_response
         mock_client.start_chat.return_value = mock_chat
+        jar._async_client = mock_client
+        
+        await jar.aexecute_many(["A", "B"])
         
-        # Set both sync and async clients to avoid lazy loading
-        jar._client = mock_client
+        for call in mock_client.start_chat.call_args_list:
+            assert call.kwargs == {
+                "history": [{"role": "user", "parts": ["Hi"]}, {"role": "model", "parts": ["Hello"]}],
+                "system_instruction": "Be brief",
+            }
+        assert [call.args[0] for call in mock_chat.send_message_async.call_args_list] == ["A", "B"]
+    
+    async def test_gemini_single_shot_prompts_skip_history_conversion(self):
+        """Test prompts sent from an empty history start sessions without converting history."""
+        jar = GeminiJar(api_key="test-key")
+    
+        mock_chat = Mock()
+        mock_chat.send_message_async = AsyncMock(return_value=Mock(text="Reply", usage_metadata=None))
+        mock_client = Mock()
+        mock_client.start_chat.return_value = mock_chat
         jar._async_client = mock_client
+    
+        with patch.object(jar, "_prepare_gemini_history") as prepare:
+            await jar.aexecute_many(["A", "B"])
+    
+        prepare.assert_not_called()
+        for call in mock_client.start_chat.call_args_list:
+            assert call.kwargs == {"history": []}
+    
+    async def test_abatch_records_turns_in_prompt_order(self):
+        """Test abatch answers against the starting history, then appends every turn."""
+        jar = MockJar(system_prompt="Be brief")
         
-        result = await jar.aexecute("Async Gemini test")
+        results = await jar.abatch(["one", "two"])
         
-        assert result == "Async Gemini response"
-        assert jar.total_tokens == 30
-        assert jar.message_count == 2
+        assert [msg["content"] for msg in jar.history[1:]] == ["one", results[0], "two", results[1]]
+        assert [msg["role"] for msg in jar.history[1:]] == ["user", "assistant", "user", "assistant"]
+        assert jar.message_count == 5
 
 
 class TestConcurrentAsyncExecution:
     """Tests for concurrent async jar usage."""
     
-    @pytest.mark.asyncio
     async def test_concurrent_jar_execution(self):
         """Test multiple jars can execute concurrently."""
         jar1 = MockJar()
         jar2 = MockJar()
         
-        async def use_jar1():
-            async with jar1:
-                return await jar1.aexecute("Request 1")
-        
-        async def use_jar2():
-            async with jar2:
-                return await jar2.aexecute("Request 2")
+        async def use_jar(jar, prompt):
+            async with jar:
+                return await jar.aexecute(prompt)
         
-        results = await asyncio.gather(use_jar1(), use_jar2())
+        results = await asyncio.gather(use_jar(jar1, "Request 1"), use_jar(jar2, "Request 2"))
         
         assert len(results) == 2
         assert "Request 1" in results[0]
@@ -163,18 +415,44 @@ class TestConcurrentAsyncExecution:
         assert jar1.message_count == 2
         assert jar2.message_count == 2
     
-    @pytest.mark.asyncio
+    async def test_same_jar_entered_from_concurrent_tasks(self, clean_jar_context):
+        """Test one jar can be entered by tasks that exit in any order."""
+        jar = MockJar()
+        
+        async def use_jar(prompt, delay):
+            async with jar:
+                await asyncio.sleep(delay)
+                assert get_active_async_jar() is jar
+                return await jar.aexecute(prompt)
+        
+        results = await asyncio.gather(use_jar("Slow", 0.01), use_jar("Fast", 0))
+        
+        assert "Slow" in results[0]
+        assert "Fast" in results[1]
+        assert get_active_async_jar() is None
+    
+    async def test_sync_jars_isolated_between_interleaved_tasks(self, clean_jar_context):
+        """Test sync jar contexts held across awaits do not leak between tasks."""
+        from honey.jars import get_active_jar
+        
+        async def use_jar(jar, delay):
+            with jar:
+                await asyncio.sleep(delay)
+                return get_active_jar() is jar
+        
+        results = await asyncio.gather(use_jar(MockJar(), 0.01), use_jar(MockJar(), 0))
+        
+        assert results == [True, True]
+        assert get_active_jar() is None
+    
     async def test_concurrent_requests_same_jar(self):
         """Test same jar handles concurrent requests."""
         jar = MockJar()
         
-        async def make_request(prompt):
-            return await jar.aexecute(prompt)
-        
         results = await asyncio.gather(
-            make_request("Concurrent 1"),
-            make_request("Concurrent 2"),
-            make_request("Concurrent 3")
+            jar.aexecute("Concurrent 1"),
+            jar.aexecute("Concurrent 2"),
+            jar.aexecute("Concurrent 3")
         )
         
         assert len(results) == 3
@@ -187,7 +465,6 @@ class TestConcurrentAsyncExecution:
 class TestAsyncJarStateManagement:
     """Tests for jar state management in async contexts."""
     
-    @pytest.mark.asyncio
     async def test_async_jar_maintains_history(self):
         """Test async jar maintains conversation history."""
         jar = MockJar()
@@ -201,7 +478,6 @@ class TestAsyncJarStateManagement:
         assert history[0]["content"] == "First"
         assert history[2]["content"] == "Second"
     
-    @pytest.mark.asyncio
     async def test_async_jar_reusable(self):
         """Test async jar is reusable across multiple async contexts."""
         jar = MockJar()
@@ -221,7 +497,6 @@ class TestAsyncJarStateManagement:
 class TestAsyncContextIsolation:
     """Tests for async context isolation."""
     
-    @pytest.mark.asyncio
     async def test_sync_and_async_contexts_isolated(self, clean_jar_context):
         """Test sync and async jars are isolated from each other."""
         from honey.jars import get_active_jar
@@ -249,7 +524,6 @@ class TestAsyncContextIsolation:
 class TestOpenAICompatibleJarAsync:
     """Tests for OpenAICompatibleJar async methods."""
     
-    @pytest.mark.asyncio
     async def test_aexecute_with_mocked_client(self):
         """Test aexecute with mocked async client."""
         jar = OpenAICompatibleJar(
@@ -257,23 +531,16 @@ class TestOpenAICompatibleJarAsync:
             base_url="http://localhost:11434/v1"
         )
         
-        # Mock async client
-        mock_client = AsyncMock()
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content="Async LLM response"))]
-        mock_response.usage = Mock(total_tokens=60)
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        jar._async_client = mock_client
+        create = AsyncMock(return_value=_openai_response("Async LLM response", 60))
+        jar._async_client = _openai_async_client(create)
         
         result = await jar.aexecute("Async test prompt")
         
         assert result == "Async LLM response"
         assert jar.total_tokens == 60
         assert jar.message_count == 2
-        mock_client.chat.completions.create.assert_called_once()
+        create.assert_called_once()
     
-    @pytest.mark.asyncio
     async def test_aexecute_passes_history_correctly(self):
         """Test aexecute passes history (not messages) to API."""
         jar = OpenAICompatibleJar(
@@ -284,10 +551,7 @@ class TestOpenAICompatibleJarAsync:
         jar.add_message("user", "Previous message")
         jar.add_message("assistant", "Previous response")
         
-        mock_client = AsyncMock()
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content="Response"))]
-        mock_response.usage = Mock(total_tokens=10)
+        mock_response = _openai_response("Response", 10)
         
         # Capture messages at call time (before assistant response is added)
         captured_messages = None
@@ -296,9 +560,7 @@ class TestOpenAICompatibleJarAsync:
             captured_messages = kwargs["messages"].copy()  # Copy the list
             return mock_response
         
-        mock_client.chat.completions.create.side_effect = capture_messages
-        
-        jar._async_client = mock_client
+        jar._async_client = _openai_async_client(capture_messages)
         await jar.aexecute("New message")
         
         # Verify the messages sent to API (captured before assistant response)
@@ -309,7 +571,6 @@ class TestOpenAICompatibleJarAsync:
         # After execute completes, history should have assistant response too
         assert len(jar.history) == 4
     
-    @pytest.mark.asyncio
     async def test_aexecute_passes_config_to_api(self):
         """Test aexecute passes configuration to API, filtering base_url and api_key."""
         jar = OpenAICompatibleJar(
@@ -319,16 +580,11 @@ class TestOpenAICompatibleJarAsync:
             max_tokens=200
         )
         
-        mock_client = AsyncMock()
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content="Response"))]
-        mock_response.usage = Mock(total_tokens=10)
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        jar._async_client = mock_client
+        create = AsyncMock(return_value=_openai_response("Response", 10))
+        jar._async_client = _openai_async_client(create)
         await jar.aexecute("Test")
         
-        call_kwargs = mock_client.chat.completions.create.call_args.kwargs
+        call_kwargs = create.call_args.kwargs
         assert call_kwargs["model"] == "llama3"
         assert call_kwargs["temperature"] == 0.8
         assert call_kwargs["max_tokens"] == 200
@@ -336,7 +592,6 @@ class TestOpenAICompatibleJarAsync:
         assert "api_key" not in call_kwargs
         assert "base_url" not in call_kwargs
     
-    @pytest.mark.asyncio
     async def test_aexecute_handles_missing_usage(self):
         """Test aexecute handles responses without usage data."""
         jar = OpenAICompatibleJar(
@@ -344,15 +599,89 @@ class TestOpenAICompatibleJarAsync:
             base_url="http://localhost:11434/v1"
         )
         
-        mock_client = AsyncMock()
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content="Response"))]
-        mock_response.usage = None  # Some APIs might not return usage
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        jar._async_client = mock_client
+        # Some APIs might not return usage
+        jar._async_client = _openai_async_client(AsyncMock(return_value=_openai_response("Response")))
         
         result = await jar.aexecute("Test")
         
         assert result == "Response"
         assert jar.total_tokens == 0  # Should not error
+
+
+class TestAsyncClientPool:
+    """Tests for the per-event-loop async connection pool."""
+    
+    async def test_async_clients_share_http_pool(self):
+        """Test async SDK clients created on one loop reuse one httpx client."""
+        anthropic_client = AnthropicJar(api_key="test-key")._get_async_client()
+        openai_client = OpenAIJar(api_key="test-key")._get_async_client()
+        
+        assert anthropic_client._client is openai_client._client
+        assert anthropic_client._client is _client_pool.get_httpx_async()
+    
+    async def test_async_sdk_client_shared_within_loop(self):
+        """Test jars with the same key reuse one async SDK client on a loop."""
+        Jar.reset_client_cache()
+        
+        first = AnthropicJar(api_key="shared-key")._get_async_client()
+        second = AnthropicJar(api_key="shared-key")._get_async_client()
+        
+        assert first is second
+    
+    def test_each_event_loop_gets_its_own_pool(self):
+        """Test pools are not shared across event loops."""
+        async def pool():
+            return _client_pool.get_httpx_async()
+        
+        assert asyncio.run(pool()) is not asyncio.run(pool())
+    
+    @pytest.mark.parametrize("jar_class, body", [
+        (AnthropicJar, {
+            "id": "msg_1", "type": "message", "role": "assistant", "model": "m",
+            "content": [{"type": "text", "text": "Hi"}], "stop_reason": "end_turn",
+            "stop_sequence": None, "usage": {"input_tokens": 1, "output_tokens": 1},
+        }),
+        (OpenAIJar, {
+            "id": "resp_1", "object": "response", "created_at": 0, "model": "m", "status": "completed",
+            "output": [{
+                "id": "msg_1", "type": "message", "role": "assistant", "status": "completed",
+                "content": [{"type": "output_text", "text": "Hi", "annotations": []}],
+            }],
+            "parallel_tool_calls": True, "tool_choice": "auto", "tools": [],
+            "usage": {
+                "input_tokens": 1, "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens": 1, "output_tokens_details": {"reasoning_tokens": 0}, "total_tokens": 2,
+            },
+        }),
+    ])
+    def test_jar_reused_across_event_loops(self, monkeypatch, jar_class, body):
+        """Test a jar keeps working in a new asyncio.run() after the first loop's pool closed."""
+        import httpx
+        
+        options = _client_pool._client_options
+        monkeypatch.setattr(
+            _client_pool, "_client_options",
+            lambda: {**options(), "transport": httpx.MockTransport(lambda request: httpx.Response(200, json=body))},
+        )
+        jar = jar_class(api_key="test-key")
+        
+        assert asyncio.run(jar.aexecute("First")) == "Hi"
+        assert asyncio.run(jar.aexecute("Second")) == "Hi"
+    
+    def test_pool_closed_when_loop_shuts_down(self):
+        """Test a loop's pool is closed and forgotten once asyncio.run finishes with the loop."""
+        async def pool():
+            client = _client_pool.get_httpx_async()
+            assert not client.is_closed
+            return client, asyncio.get_running_loop()
+        
+        client, loop = asyncio.run(pool())
+        
+        assert client.is_closed
+        assert loop not in _client_pool._async_clients
+    
+    async def test_closing_sdk_client_keeps_shared_pool_open(self):
+        """Test one async SDK client's close() does not close the loop's pool."""
+        await AnthropicJar(api_key="closing-key")._get_async_client().close()
+        
+        assert not _client_pool.get_httpx_async().is_closed
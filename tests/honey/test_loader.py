@@ -1,8 +1,11 @@
 """Synchronous tests for the .hny file loader."""
 
+import os
 import sys
 import pytest
 from pathlib import Path
+from types import ModuleType
+from unittest.mock import MagicMock, patch
 from honey import loader
 
 
@@ -33,6 +36,12 @@ class TestParseHnyFile:
         assert "{{text}}" in prompts["summarize"]
         assert "{{language}}" in prompts["translate"]
     
+    def test_parse_source_string(self):
+        """Test parsing .hny source text without a file."""
+        prompts = loader.parse_hny_source("greet\nHello, {{name}}!\n---\nbye\nBye!")
+        
+        assert prompts == {"greet": "Hello, {{name}}!", "bye": "Bye!"}
+    
     def test_parse_empty_file(self, temp_hny_file):
         """Test parsing an empty .hny file."""
         hny_path = temp_hny_file("", "empty.hny")
@@ -52,6 +61,16 @@ class TestParseHnyFile:
         assert "prompt1" in prompts
         assert "prompt2" in prompts
     
+    def test_parse_ignores_non_separator_dashes(self, temp_hny_file):
+        """Test that short dash runs and dashes followed by text do not split prompts."""
+        content = "prompt1\n- item\n--\n---not a separator\n---\nprompt2\nContent 2"
+        hny_path = temp_hny_file(content, "dash_content.hny")
+        
+        prompts = loader.parse_hny_file(hny_path)
+        
+        assert list(prompts) == ["prompt1", "prompt2"]
+        assert prompts["prompt1"] == "- item\n--\n---not a separator"
+    
     def test_parse_complex_jinja(self, prompts_dir):
         """Test parsing prompts with Jinja2 logic."""
         complex_hny = prompts_dir / "complex.hny"
@@ -93,6 +112,16 @@ class TestPromptFunctionCreation:
         assert func.__template__ == template
         assert hasattr(func, "__doc__")
     
+    def test_identical_templates_share_compiled_template(self):
+        """Test identical template sources are compiled only once."""
+        template = "Shared {{value}}"
+        
+        assert loader._compile_template(template) is loader._compile_template(template)
+        
+        func1 = loader.create_prompt_function(template)
+        func2 = loader.create_prompt_function(template)
+        assert func1(value="a") == func2(value="a") == "Shared a"
+    
     def test_function_without_jar_context(self, clean_jar_context):
         """Test function returns string when no jar context active."""
         template = "Hello, {{name}}!"
@@ -113,6 +142,87 @@ class TestPromptFunctionCreation:
         
         assert result1 == "Premium user"
         assert result2 == "Basic user"
+    
+    def test_function_has_jinja_globals(self):
+        """Test templates can use Jinja2 globals such as range."""
+        func = loader.create_prompt_function("{% for i in range(n) %}{{i}}{% endfor %}")
+        
+        assert func(n=3) == "012"
+    
+    def test_render_errors_propagate(self):
+        """Test errors raised while rendering reach the caller."""
+        func = loader.create_prompt_function("{{ 1 / divisor }}")
+        
+        with pytest.raises(ZeroDivisionError):
+            func(divisor=0)
+    
+    def test_identical_arguments_render_once(self):
+        """Test repeated calls with the same arguments reuse the rendered prompt."""
+        template = MagicMock()
+        template.render.return_value = "rendered"
+        func = loader.create_prompt_function("{{text}}", template, cache_size=256)
+        
+        assert func(text="same") == "rendered"
+        assert func(text="same") == "rendered"
+        func(text="other")
+        
+        assert template.render.call_count == 2
+    
+    def test_unhashable_arguments_are_rendered(self):
+        """Test unhashable values bypass the render cache."""
+        func = loader.create_prompt_function("{% for i in items %}{{i}}{% endfor %}", cache_size=256)
+        items = [1, 2]
+        
+        assert func(items=items) == "12"
+        items.append(3)
+        assert func(items=items) == "123"
+    
+    def test_equal_arguments_of_different_types_are_rendered(self):
+        """Test 1, True and 1.0 do not share a memoized render."""
+        func = loader.create_prompt_function("{{value}}", cache_size=256)
+        
+        assert func(value=1) == "1"
+        assert func(value=True) == "True"
+        assert func(value=1.0) == "1.0"
+        assert func(value=(1, True)) == "(1, True)"
+        assert func(value=(True, 1.0)) == "(True, 1.0)"
+    
+    def test_mutated_object_is_rendered_again(self):
+        """Test hashable objects that change between calls are not memoized."""
+        
+        class User:
+            def __init__(self, name):
+                self.name = name
+        
+        func = loader.create_prompt_function("Hello {{user.name}}", cache_size=256)
+        user = User("Ada")
+        
+        assert func(user=user) == "Hello Ada"
+        user.name = "Grace"
+        assert func(user=user) == "Hello Grace"
+    
+    def test_render_cache_off_by_default(self):
+        """Test renders are not memoized unless a cache_size is given."""
+        template = MagicMock()
+        template.render.return_value = "rendered"
+        func = loader.create_prompt_function("{{text}}", template)
+        
+        func(text="same")
+        func(text="same")
+        
+        assert template.render.call_count == 2
+    
+    def test_cache_clear(self):
+        """Test cache_clear forces the next call to render again."""
+        template = MagicMock()
+        template.render.return_value = "rendered"
+        func = loader.create_prompt_function("{{text}}", template, cache_size=256)
+        
+        func(text="same")
+        func.cache_clear()
+        func(text="same")
+        
+        assert template.render.call_count == 2
 
 
 class TestHnyFinder:
@@ -150,6 +260,45 @@ class TestHnyFinder:
         assert spec is None
 
 
+    def test_find_spec_caches_directory_listing(self, prompts_dir, isolated_sys_path):
+        """Test that repeated lookups do not list the directory again."""
+        sys.path.insert(0, str(prompts_dir))
+        finder = loader.HnyFinder()
+        
+        with patch("honey.loader.os.listdir", wraps=os.listdir) as listdir:
+            assert finder.find_spec("simple") is not None
+            assert finder.find_spec("multi") is not None
+            assert finder.find_spec("nonexistent") is None
+        
+        listed = [call.args[0] for call in listdir.call_args_list]
+        assert listed.count(str(prompts_dir)) == 1
+    
+    def test_invalidate_caches_finds_new_files(self, tmp_path, isolated_sys_path):
+        """Test that invalidating caches picks up newly created .hny files."""
+        sys.path.insert(0, str(tmp_path))
+        finder = loader.HnyFinder()
+        
+        assert finder.find_spec("late") is None
+        
+        (tmp_path / "late.hny").write_text("greet\nHi")
+        finder.invalidate_caches()
+        
+        assert finder.find_spec("late") is not None
+    
+    def test_invalidate_caches_for_one_directory(self, tmp_path, prompts_dir, isolated_sys_path):
+        """Test invalidating one directory keeps the other listings cached."""
+        sys.path.insert(0, str(prompts_dir))
+        sys.path.insert(0, str(tmp_path))
+        finder = loader.HnyFinder()
+        assert finder.find_spec("simple") is not None
+        
+        finder.invalidate_caches(str(tmp_path))
+        
+        with patch("honey.loader.os.listdir", wraps=os.listdir) as listdir:
+            finder.find_spec("simple")
+        assert [call.args[0] for call in listdir.call_args_list] == [str(tmp_path)]
+
+
 class TestHnyLoader:
     """Tests for HnyLoader class."""
     
@@ -175,6 +324,108 @@ class TestHnyLoader:
         assert "translate" in multi.__prompts__
         assert "analyze" in multi.__prompts__
         assert hasattr(multi, "__file__")
+    
+    def test_find_spec_reuses_loader(self, prompts_dir, isolated_sys_path):
+        """Test repeated finds of the same file share one loader."""
+        sys.path.insert(0, str(prompts_dir))
+        finder = loader.HnyFinder()
+        
+        assert finder.find_spec("simple").loader is finder.find_spec("simple").loader
+    
+    def test_reload_reuses_parsed_templates(self, tmp_path, isolated_sys_path):
+        """Test reloading an unchanged file does not parse it again."""
+        (tmp_path / "reloaded.hny").write_text("greet\nHi {{name}}")
+        sys.path.insert(0, str(tmp_path))
+        import importlib
+        import reloaded
+        
+        with patch("honey.loader.parse_hny_file") as parse:
+            importlib.reload(reloaded)
+        
+        parse.assert_not_called()
+        assert reloaded.greet(name="A") == "Hi A"
+    
+    def test_reload_picks_up_changes(self, tmp_path, isolated_sys_path):
+        """Test reloading after the file changes uses the new templates."""
+        hny_file = tmp_path / "edited.hny"
+        hny_file.write_text("greet\nHi {{name}}")
+        sys.path.insert(0, str(tmp_path))
+        import importlib
+        import edited
+        
+        hny_file.write_text("greet\nHello there, {{name}}")
+        importlib.reload(edited)
+        
+        assert edited.greet(name="A") == "Hello there, A"
+
+
+class TestHnyCache:
+    """Tests for the __hnycache__ compiled template cache."""
+    
+    @pytest.fixture(autouse=True)
+    def allow_cache_writes(self, monkeypatch):
+        monkeypatch.setattr(sys, "dont_write_bytecode", False)
+    
+    def _exec(self, hny_path):
+        module = ModuleType(hny_path.stem)
+        loader.HnyLoader(hny_path).exec_module(module)
+        return module
+    
+    def test_exec_module_writes_cache(self, tmp_path):
+        """Test that loading a .hny file writes a cache file."""
+        hny_path = tmp_path / "cached.hny"
+        hny_path.write_text("greet\nHello, {{name}}!")
+        
+        self._exec(hny_path)
+        
+        assert list((tmp_path / "__hnycache__").glob("cached.*.hnyc"))
+    
+    def test_cached_load_skips_parsing(self, tmp_path):
+        """Test that an up-to-date cache is used instead of parsing the source."""
+        hny_path = tmp_path / "cached.hny"
+        hny_path.write_text("greet\nHello, {{name}}!\n---\nbye\nBye {{name}}")
+        self._exec(hny_path)
+        
+        with patch("honey.loader.parse_hny_file", side_effect=AssertionError("parsed")):
+            module = self._exec(hny_path)
+        
+        assert module.__prompts__ == ["greet", "bye"]
+        assert module.greet(name="Cache") == "Hello, Cache!"
+        assert module.greet.__template__ == "Hello, {{name}}!"
+    
+    def test_changed_source_invalidates_cache(self, tmp_path):
+        """Test that editing the source is picked up despite the cache."""
+        hny_path = tmp_path / "cached.hny"
+        hny_path.write_text("greet\nHello, {{name}}!")
+        self._exec(hny_path)
+        
+        hny_path.write_text("greet\nGoodbye, {{name}}!")
+        module = self._exec(hny_path)
+        
+        assert module.greet(name="Cache") == "Goodbye, Cache!"
+    
+    def test_corrupt_cache_is_ignored(self, tmp_path):
+        """Test that an unreadable cache file falls back to parsing."""
+        hny_path = tmp_path / "cached.hny"
+        hny_path.write_text("greet\nHello, {{name}}!")
+        self._exec(hny_path)
+        
+        for cache_file in (tmp_path / "__hnycache__").glob("*.hnyc"):
+            cache_file.write_bytes(b"not a cache")
+        
+        module = self._exec(hny_path)
+        
+        assert module.greet(name="Cache") == "Hello, Cache!"
+    
+    def test_respects_dont_write_bytecode(self, tmp_path, monkeypatch):
+        """Test that no cache is written when bytecode writing is disabled."""
+        monkeypatch.setattr(sys, "dont_write_bytecode", True)
+        hny_path = tmp_path / "cached.hny"
+        hny_path.write_text("greet\nHello, {{name}}!")
+        
+        self._exec(hny_path)
+        
+        assert not (tmp_path / "__hnycache__").exists()
 
 
 class TestLoaderIntegration:
@@ -216,3 +467,30 @@ class TestLoaderIntegration:
         count_after = sys.meta_path.count(loader._finder)
         
         assert count_before == count_after == 1
+    
+    def test_install_sets_render_cache_size(self, temp_hny_file, isolated_sys_path, monkeypatch):
+        """Test install(render_cache_size=...) turns on memoization for later .hny imports."""
+        import importlib
+        monkeypatch.setattr(loader, "_render_cache_size", 0)
+        temp_hny_file("greet\nHello {{name}}!", "plain_prompts.hny")
+        temp_hny_file("greet\nHello {{name}}!", "memo_prompts.hny")
+        
+        plain = importlib.import_module("plain_prompts")
+        loader.install(render_cache_size=8)
+        memo = importlib.import_module("memo_prompts")
+        loader.install()
+        
+        assert plain.greet._cached_render is None
+        assert memo.greet._cached_render.cache_info().maxsize == 8
+        assert loader._render_cache_size == 8
+    
+    def test_install_runs_after_builtin_importers(self, isolated_meta_path):
+        """Test the finder is placed after built-in importers but before PathFinder."""
+        from importlib.machinery import BuiltinImporter, PathFinder
+        loader.uninstall()
+        
+        loader.install()
+        
+        index = sys.meta_path.index(loader._finder)
+        assert sys.meta_path.index(BuiltinImporter) < index
+        assert index < sys.meta_path.index(PathFinder)